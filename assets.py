@@ -0,0 +1,42 @@
+"""Sayfalarda kullanılan statik dosyaların (logo) yerel kopyaları.
+
+Sunucu sayfa yüklenirken uzak sunucuya istek yapmaz; dosyalar assets/ altından
+gösterilir. Kopya yoksa `python prewarm.py` ağ erişimi olan bir ortamda bir kez
+indirir. Çevrimdışı ortamlarda dosya assets/ altına elle eklenebilir; kopya
+yoksa depoyla gelen yer tutucu logo (assets/logo_placeholder.png) gösterilir.
+"""
+import os
+import shutil
+import urllib.request
+
+ASSETS_DIR = "assets"
+LOGO_URL = "https://tgtof.org.tr/wp-content/uploads/2019/08/TGTOF_navy.png"
+LOGO_PATH = os.path.join(ASSETS_DIR, "TGTOF_navy.png")
+# Depoyla birlikte gelen yazı logosu; indirilen kopya yokken kullanılır
+LOGO_PLACEHOLDER_PATH = os.path.join(ASSETS_DIR, "logo_placeholder.png")
+
+
+def fetch_asset(url, path, timeout=10):
+    """Dosya yerelde yoksa indirir; yerel kopya varsa True.
+
+    İndirme geçici dosyaya yapılır; yarım kalan indirme kopya olarak bırakılmaz.
+    """
+    if os.path.exists(path):
+        return True
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    try:
+        with urllib.request.urlopen(url, timeout=timeout) as response, open(tmp_path, "wb") as f:
+            shutil.copyfileobj(response, f)
+    except OSError:
+        # Ağ yok ya da sunucu yanıt vermedi (URLError, OSError'ın alt sınıfıdır)
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        return False
+    os.replace(tmp_path, path)
+    return True
+
+
+def logo_path():
+    """Logonun yerel kopyası; indirilmemişse depodaki yer tutucu."""
+    return LOGO_PATH if os.path.exists(LOGO_PATH) else LOGO_PLACEHOLDER_PATH
@@ -0,0 +1,354 @@
+"""main.py ve melike.py için ölçeklenebilir performans ölçümü.
+
+Sentetik veri setleriyle her iki panoyu Streamlit AppTest üzerinden başsız
+çalıştırır ve aşama başına süre ile en yüksek bellek kullanımını raporlar.
+Uygulama aşamalarında profiler.py açık çalışır; her çalıştırmanın bölüm süreleri
+(veri yükleme, toplama, çizim, savefig, st.image...) "aşama › bölüm" olarak eklenir.
+
+    python -m benchmarks.run                       # varsayılan boyutlar
+    python -m benchmarks.run --salon 10000 --lab 100000 --output sonuc.json
+    python -m benchmarks.run --baseline onceki.json --tolerance 0.25
+
+Her boyut, .cache/benchmarks/work altında boş bir çalışma klasöründe çalışır;
+böylece Parquet kopyaları, grafik önbelleği ve dışa aktarılan figürler soğuk
+başlar ve depodaki dosyalara dokunulmaz. Bellek ölçümü tracemalloc ile ayrı bir
+tekrarda yapılır; süreler izleme yükünden etkilenmez.
+"""
+import argparse
+import json
+import os
+import shutil
+import sys
+import time
+import tracemalloc
+from dataclasses import asdict, dataclass
+
+import streamlit as st
+from streamlit.testing.v1 import AppTest
+
+from benchmarks.synthetic import XLSX_MAX_ROWS, lab_dataset, salon_dataset
+from datastore import CACHE_DIR
+from profiler import PROFILE_PARAM, RUN_KEY
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+WORK_DIR = os.path.join(ROOT, CACHE_DIR, "benchmarks", "work")
+
+SALON_SIZES = [10_000, 100_000, 1_000_000]
+LAB_SIZES = [100_000, XLSX_MAX_ROWS]
+APP_TIMEOUT = 1800
+COMPARISON_PANELS = 30
+# Sentetik müsabaka verisinin aktarıldığı sezon
+BENCHMARK_SEASON = 2025
+# Milisaniyelik bölümlerdeki gürültü gerileme sayılmaz
+MIN_REGRESSION_SECONDS = .05
+
+
+@dataclass
+class Measurement:
+    app: str
+    rows: int
+    stage: str
+    seconds: float
+    peak_mb: float = None
+
+
+def clear_streamlit_caches():
+    st.cache_data.clear()
+    st.cache_resource.clear()
+
+
+def prepare_workspace(name, dataset, target):
+    """Boş bir çalışma klasörü kurar ve veri setini `target` adıyla bağlar."""
+    workspace = os.path.join(WORK_DIR, name)
+    shutil.rmtree(workspace, ignore_errors=True)
+    os.makedirs(os.path.join(workspace, os.path.dirname(target)), exist_ok=True)
+    os.symlink(os.path.abspath(dataset), os.path.join(workspace, target))
+    os.symlink(os.path.join(ROOT, "documents"), os.path.join(workspace, "documents"))
+    os.symlink(os.path.join(ROOT, "assets"), os.path.join(workspace, "assets"))
+    return workspace
+
+
+def remove_local_cache():
+    shutil.rmtree(CACHE_DIR, ignore_errors=True)
+
+
+def run_app(at):
+    """Uygulamayı çalıştırır ve profiler'ın (profiler.py) bu çalıştırmada ölçtüğü bölümleri döndürür."""
+    at.run(timeout=APP_TIMEOUT)
+    if at.exception:
+        raise RuntimeError(at.exception[0].value)
+    run = at.session_state[RUN_KEY] if RUN_KEY in at.session_state else None
+    return run["sections"] if run else []
+
+
+def new_app(app_path):
+    at = AppTest.from_file(app_path, default_timeout=APP_TIMEOUT)
+    at.query_params[PROFILE_PARAM] = "1"
+    return at
+
+
+def measure(stage, trace_memory=False):
+    """`stage` = (ad, hazırlık, ölçülen fonksiyon).
+
+    Süre ya da tracemalloc bellek tepe değeri (MB) ile fonksiyonun döndürdüğü
+    uygulama bölümlerini verir.
+    """
+    name, setup, fn = stage
+    if setup:
+        setup()
+    if not trace_memory:
+        start = time.perf_counter()
+        sections = fn()
+        return time.perf_counter() - start, sections
+    tracemalloc.start()
+    try:
+        sections = fn()
+        return tracemalloc.get_traced_memory()[1] / 2 ** 20, sections
+    finally:
+        tracemalloc.stop()
+
+
+def section_seconds(sections):
+    """Aynı adlı bölümlerin toplam süresi (sn), ilk görülme sırasıyla."""
+    totals = {}
+    for record in sections or []:
+        totals[record["section"]] = totals.get(record["section"], 0) + record["duration_ms"] / 1000
+    return totals
+
+
+def salon_stages(app_path):
+    """main.py aşamaları: CSV ayrıştırma, sezon arşivi, küp, kutu istatistikleri, sıralamalar ve uygulama çalıştırmaları."""
+    import salon_archive
+    import salon_data
+    import salon_ranking
+
+    state = {}
+
+    def cold():
+        clear_streamlit_caches()
+        remove_local_cache()
+
+    def parse():
+        salon_data.parse_results_csv(salon_data.RESULTS_PATH)
+
+    def archive():
+        salon_archive.import_results(salon_data.RESULTS_PATH, BENCHMARK_SEASON, "salon")
+
+    def read():
+        state["df"] = salon_archive.scan_results(BENCHMARK_SEASON, "salon")
+
+    def scan():
+        df = state["df"]
+        salon_archive.scan_results(BENCHMARK_SEASON, "salon", cities=df["İL"].cat.categories[:5],
+                                   categories=df["KATEGORİ"].cat.categories[:1])
+
+    def cube():
+        state["cube"] = salon_data.build_score_cube(state["df"])
+
+    def box_stats():
+        cube = state["cube"]
+        for column in ("İL", "KATEGORİ", "KULÜB"):
+            hists = cube.histograms_by(column)
+            salon_data.box_stats_by(hists[hists.index.notna()])
+
+    def rankings():
+        state["rankings"] = salon_ranking.build_rankings(state["df"])
+
+    def app_cold():
+        state["at"] = new_app(app_path)
+        return run_app(state["at"])
+
+    def app_rerun():
+        return run_app(state["at"])
+
+    def app_filter():
+        at = state["at"]
+        categories = at.sidebar.multiselect[1]
+        categories.set_value(categories.value[:1] if len(categories.value) > 1 else categories.options)
+        return run_app(at)
+
+    def app_vector():
+        at = state["at"]
+        at.sidebar.radio[0].set_value(at.sidebar.radio[0].options[1])
+        sections = run_app(at)
+        at.sidebar.radio[0].set_value(at.sidebar.radio[0].options[0])
+        return sections
+
+    return [
+        ("CSV ayrıştırma", None, parse),
+        ("Arşive aktarma (CSV -> sezon bölümü)", None, archive),
+        ("Bölüm okuma (tüm sütunlar)", None, read),
+        ("Bölüm taraması (5 il, 1 kategori)", None, scan),
+        ("İstatistik küpü", None, cube),
+        ("Kutu istatistikleri (il/kategori/kulüp)", None, box_stats),
+        ("Sıralamalar (kategori/il/kulüp)", None, rankings),
+        ("Uygulama: ilk çalıştırma (soğuk)", cold, app_cold),
+        ("Uygulama: yeniden çalıştırma", None, app_rerun),
+        ("Uygulama: filtre değişimi", None, app_filter),
+        ("Uygulama: vektör modu", None, app_vector),
+    ]
+
+
+def lab_stages(app_path):
+    """melike.py aşamaları: çalışma kitabı aktarımı, tahlil indeksi, anormallik taraması ve uygulama çalıştırmaları."""
+    import lab_anomaly
+    import lab_data
+
+    state = {}
+
+    def cold():
+        clear_streamlit_caches()
+        remove_local_cache()
+
+    def ingest():
+        state["df"] = lab_data.ingest_lab_results()
+
+    def load():
+        state["df"] = lab_data.load_lab_results()
+
+    def index():
+        state["index"] = lab_data.build_test_index(state["df"])
+
+    def downsample():
+        index = state["index"]
+        for name in index.names[:COMPARISON_PANELS]:
+            lab_data.downsample_indices(index.get(name), 1200)
+
+    def anomalies():
+        lab_anomaly.build_anomaly_report(state["index"])
+
+    def app_cold():
+        state["at"] = new_app(app_path)
+        return run_app(state["at"])
+
+    def app_rerun():
+        return run_app(state["at"])
+
+    def app_switch():
+        at = state["at"]
+        at.selectbox[0].set_value(at.selectbox[0].options[-1])
+        return run_app(at)
+
+    def app_comparison():
+        at = state["at"]
+        at.multiselect[0].set_value(at.selectbox[0].options[:COMPARISON_PANELS])
+        sections = run_app(at)
+        at.multiselect[0].set_value([])
+        return sections
+
+    return [
+        ("Aktarım (xlsx -> Parquet)", cold, ingest),
+        ("Yükleme (Parquet)", clear_streamlit_caches, load),
+        ("Tahlil indeksi", None, index),
+        (f"Seyreltme ({COMPARISON_PANELS} tahlil)", None, downsample),
+        ("Anormallik taraması (tüm tahliller)", None, anomalies),
+        ("Uygulama: ilk çalıştırma (soğuk)", cold, app_cold),
+        ("Uygulama: yeniden çalıştırma", None, app_rerun),
+        ("Uygulama: tahlil değişimi", None, app_switch),
+        (f"Uygulama: karşılaştırma ({COMPARISON_PANELS} panel)", None, app_comparison),
+    ]
+
+
+SUITES = {
+    # uygulama: (betik, veri seti üreticisi, çalışma klasöründeki veri yolu, aşamalar)
+    "main.py": ("main.py", salon_dataset, os.path.join("dataset", "2025salonfinal.csv"), salon_stages),
+    "melike.py": ("melike.py", lab_dataset, os.path.join("dataset", "melike-tahlil-merged_final.xlsx"),
+                  lab_stages),
+}
+
+
+def run_stages(app, rows, trace_memory):
+    """Aşamaları boş bir çalışma klasöründe sırayla çalıştırır.
+
+    {aşama: ölçüm} ile uygulama aşamalarının bölüm süreleri
+    ({"aşama › bölüm": sn}) döner.
+    """
+    script, make_dataset, target, stages = SUITES[app]
+    workspace = prepare_workspace(f"{os.path.splitext(app)[0]}-{rows}", make_dataset(rows), target)
+    cwd = os.getcwd()
+    os.chdir(workspace)
+    try:
+        values, sections = {}, {}
+        for stage in stages(os.path.join(ROOT, script)):
+            values[stage[0]], stage_sections = measure(stage, trace_memory)
+            unit = "MB" if trace_memory else "sn"
+            print(f"[{app} / {rows} satır] {stage[0]}: {values[stage[0]]:.3f} {unit}", file=sys.stderr)
+            for name, seconds in section_seconds(stage_sections).items():
+                sections[f"{stage[0]} › {name}"] = seconds
+        return values, sections
+    finally:
+        os.chdir(cwd)
+        clear_streamlit_caches()
+
+
+def run_suite(app, rows, memory):
+    # Süreler ve bellek ayrı geçişlerde ölçülür; tracemalloc süreleri birkaç kat uzatır
+    seconds, sections = run_stages(app, rows, trace_memory=False)
+    peaks = run_stages(app, rows, trace_memory=True)[0] if memory else {}
+    results = [Measurement(app, rows, stage, value, peaks.get(stage)) for stage, value in seconds.items()]
+    # Uygulama içi bölüm süreleri yalnızca süre geçişinden alınır
+    return results + [Measurement(app, rows, stage, value) for stage, value in sections.items()]
+
+
+def print_table(results):
+    header = f"{'Uygulama':<10} {'Satır':>10}  {'Aşama':<72} {'Süre (sn)':>10} {'Bellek (MB)':>12}"
+    print(header)
+    print("-" * len(header))
+    for m in results:
+        peak = f"{m.peak_mb:12.1f}" if m.peak_mb is not None else f"{'-':>12}"
+        print(f"{m.app:<10} {m.rows:>10}  {m.stage:<72} {m.seconds:10.3f} {peak}")
+
+
+def find_regressions(results, baseline, tolerance):
+    """Taban ölçüme göre `tolerance` oranından fazla yavaşlayan ya da büyüyen aşamalar."""
+    previous = {(m["app"], m["rows"], m["stage"]): m for m in baseline}
+    regressions = []
+    for m in results:
+        old = previous.get((m.app, m.rows, m.stage))
+        if old is None:
+            continue
+        if m.seconds > old["seconds"] * (1 + tolerance) and m.seconds - old["seconds"] > MIN_REGRESSION_SECONDS:
+            regressions.append(f"{m.app} / {m.rows} / {m.stage}: {old['seconds']:.3f} -> {m.seconds:.3f} sn")
+        if m.peak_mb is not None and old.get("peak_mb") and m.peak_mb > old["peak_mb"] * (1 + tolerance):
+            regressions.append(f"{m.app} / {m.rows} / {m.stage}: {old['peak_mb']:.1f} -> {m.peak_mb:.1f} MB")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Pano performans ölçümü (sentetik veri)")
+    parser.add_argument("--salon", type=int, nargs="*", default=SALON_SIZES,
+                        help="main.py için satır sayıları (boş: atla)")
+    parser.add_argument("--lab", type=int, nargs="*", default=LAB_SIZES,
+                        help=f"melike.py için satır sayıları (en fazla {XLSX_MAX_ROWS}; boş: atla)")
+    parser.add_argument("--no-memory", dest="memory", action="store_false",
+                        help="tracemalloc ile bellek ölçümü yapma")
+    parser.add_argument("--output", help="Sonuçların yazılacağı JSON dosyası")
+    parser.add_argument("--baseline", help="Karşılaştırılacak önceki JSON sonuçları")
+    parser.add_argument("--tolerance", type=float, default=.25,
+                        help="Gerileme sayılacak en küçük oran (varsayılan 0.25)")
+    args = parser.parse_args(argv)
+
+    results = []
+    for rows in args.salon:
+        results += run_suite("main.py", rows, args.memory)
+    for rows in args.lab:
+        results += run_suite("melike.py", rows, args.memory)
+    print_table(results)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump([asdict(m) for m in results], f, ensure_ascii=False, indent=2)
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            regressions = find_regressions(results, json.load(f), args.tolerance)
+        if regressions:
+            print("\nGerilemeler:")
+            for line in regressions:
+                print(f"  {line}")
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
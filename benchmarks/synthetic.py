@@ -0,0 +1,156 @@
+"""Şema olarak gerçek veriyle aynı, ölçeklenebilir sentetik veri setleri.
+
+Üretilen dosyalar .cache/benchmarks/data altında boyut ve tohum değerine göre
+saklanır; aynı boyut için ikinci çalıştırmada yeniden üretilmez.
+"""
+import os
+
+import numpy as np
+import pandas as pd
+from openpyxl import Workbook
+
+from datastore import CACHE_DIR
+
+DATA_DIR = os.path.join(CACHE_DIR, "benchmarks", "data")
+
+# Excel sayfa sınırı: 1.048.576 satır, biri başlık
+XLSX_MAX_ROWS = 1_048_575
+
+SALON_COLUMNS = ["id", "SIRANO", "İL", "KULÜB", "ADI", "KATEGORİ", "GRUP", "PUTA",
+                 "SERİSİ", "HALKAPUANI", "İSABET", "TOPLAM", "AÇIKLAMA"]
+SALON_CATEGORIES = ["GENÇ ERKEK", "GENÇ KIZ", "BÜYÜK KADIN", "BÜYÜK ERKEK"]
+SALON_GROUPS = ["1.GRUP", "2.GRUP", "3.GRUP", "4.GRUP"]
+SALON_SERIES = ["A", "B", "C", "D"]
+NOT_PARTICIPATED = "Yarışmaya Katılmadı"
+
+LAB_COLUMNS = ["ID", "Tarih", "Tahlil", "Sonuç", "Sonuç Birimi", "Referans Değeri", "Test"]
+LAB_UNITS = ["10^3/μL", "%", "g/dL", "fL", "pg", "mg/dL", "U/L", "mmol/L", "ng/mL", "sn"]
+LAB_GROUPS = ["Tam Kan Sayimi (Hemogram)", "Biyokimya", "Koagülasyon", "İdrar Tahlili", "Kan Gazı"]
+LAB_DATE_FORMAT = "%d.%m.%Y %H:%M:%S"
+
+
+def _decimal(value):
+    # Çalışma kitabındaki gibi ondalık virgül
+    return f"{value:g}".replace(".", ",")
+
+
+def salon_frame(rows, seed=0):
+    """2025salonfinal.csv sütunlarıyla `rows` satırlık sonuç tablosu.
+
+    Kulüp sayısı satır sayısının kareköküyle büyür; sporcuların yaklaşık %10'u
+    yarışmaya katılmamıştır (puanlar boş, TOPLAM 0).
+    """
+    rng = np.random.default_rng(seed)
+    n_cities = 81
+    n_clubs = max(20, int(2 * np.sqrt(rows)))
+    club_city = rng.integers(0, n_cities, n_clubs)
+    club = rng.integers(0, n_clubs, rows)
+
+    participated = rng.random(rows) >= .1
+    halka = np.clip(rng.normal(45, 15, rows), 0, 87).round()
+    isabet = np.clip(rng.normal(15, 6, rows), 0, 30).round()
+    halka[~participated] = np.nan
+    isabet[~participated] = np.nan
+    total = np.where(participated, np.nan_to_num(halka) + np.nan_to_num(isabet), 0).astype(np.int64)
+
+    ids = np.arange(rows)
+    return pd.DataFrame({
+        "id": ids,
+        "SIRANO": ids + 1,
+        "İL": np.array([f"İL {i + 1:02d}" for i in range(n_cities)])[club_city[club]],
+        "KULÜB": np.array([f"{i + 1} SPOR KULÜBÜ" for i in range(n_clubs)])[club],
+        "ADI": [f"SPORCU {i + 1}" for i in ids],
+        "KATEGORİ": np.array(SALON_CATEGORIES)[rng.integers(0, 4, rows)],
+        "GRUP": np.array(SALON_GROUPS)[rng.integers(0, 4, rows)],
+        "PUTA": rng.integers(1, 27, rows),
+        "SERİSİ": np.array(SALON_SERIES)[rng.integers(0, 4, rows)],
+        "HALKAPUANI": halka,
+        "İSABET": isabet,
+        "TOPLAM": total,
+        "AÇIKLAMA": np.where(participated, None, NOT_PARTICIPATED),
+    }, columns=SALON_COLUMNS)
+
+
+def lab_tests(n_tests, seed=0):
+    """Tahlil adı, birim, referans aralığı, grup ve ortalama değer tablosu."""
+    rng = np.random.default_rng(seed)
+    lows = rng.choice([0, .5, 1, 3.5, 12, 35, 80, 135], n_tests)
+    highs = lows + rng.choice([.1, 1, 2.5, 5, 10, 50, 120], n_tests)
+    references = [f"{_decimal(low)} - {_decimal(high)}" for low, high in zip(lows, highs)]
+    # Gerçek veride olduğu gibi bazı tahliller sayısal aralık içermez ya da boştur
+    kinds = rng.random(n_tests)
+    references = [None if kind < .05 else "NEGATİF - 0" if kind < .08 else reference
+                  for kind, reference in zip(kinds, references)]
+    return pd.DataFrame({
+        "Tahlil": [f"TAHLİL {i + 1:03d} ({'KAN' if i % 3 else 'SERUM/PLAZMA'})" for i in range(n_tests)],
+        "Sonuç Birimi": np.array(LAB_UNITS)[rng.integers(0, len(LAB_UNITS), n_tests)],
+        "Referans Değeri": references,
+        "Test": np.array(LAB_GROUPS)[rng.integers(0, len(LAB_GROUPS), n_tests)],
+        "mid": (lows + highs) / 2,
+        "spread": (highs - lows) / 2 + .1,
+    })
+
+
+def lab_frame(rows, n_tests=200, panel_size=25, seed=0):
+    """Tahlil çalışma kitabı sütunlarıyla `rows` satırlık sonuç tablosu.
+
+    Her numune alımında (`panel_size` tahlil) aynı tarih kullanılır; tarihler
+    satır sayısıyla birlikte yıllara yayılır ve çalışma kitabı en yeni tarih
+    başta olacak şekilde sıralıdır.
+    """
+    rng = np.random.default_rng(seed)
+    tests = lab_tests(n_tests, seed)
+    n_draws = -(-rows // panel_size)
+    start = np.datetime64("2020-01-01T00:00")
+    draw_minutes = np.sort(rng.integers(0, max(n_draws * 8 * 60, 1), n_draws))[::-1]
+    draw_dates = pd.to_datetime(start + draw_minutes.astype("timedelta64[m]"))
+
+    draw = np.repeat(np.arange(n_draws), panel_size)[:rows]
+    test = rng.integers(0, n_tests, rows)
+    values = tests["mid"].to_numpy()[test] + tests["spread"].to_numpy()[test] * rng.normal(0, 1.2, rows)
+    return pd.DataFrame({
+        "ID": np.arange(1, rows + 1),
+        "Tarih": draw_dates.strftime(LAB_DATE_FORMAT).to_numpy()[draw],
+        "Tahlil": tests["Tahlil"].to_numpy()[test],
+        "Sonuç": np.abs(values).round(2),
+        "Sonuç Birimi": tests["Sonuç Birimi"].to_numpy()[test],
+        "Referans Değeri": tests["Referans Değeri"].to_numpy()[test],
+        "Test": tests["Test"].to_numpy()[test],
+    }, columns=LAB_COLUMNS)
+
+
+def write_lab_workbook(df, path, sheet_name="Sheet1"):
+    """Tabloyu openpyxl'in akış (write_only) moduyla çalışma kitabına yazar."""
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet(sheet_name)
+    ws.append(list(df.columns))
+    for row in df.itertuples(index=False, name=None):
+        ws.append([None if isinstance(value, float) and np.isnan(value) else value for value in row])
+    tmp_path = f"{path}.tmp"
+    wb.save(tmp_path)
+    os.replace(tmp_path, path)
+
+
+def salon_dataset(rows, seed=0, directory=DATA_DIR):
+    """`rows` satırlık sentetik müsabaka CSV'sinin yolu (gerekirse üretilir)."""
+    path = os.path.join(directory, f"salon-{rows}-{seed}.csv")
+    if not os.path.exists(path):
+        os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        salon_frame(rows, seed).to_csv(tmp_path, index=False)
+        os.replace(tmp_path, path)
+    return path
+
+
+def lab_dataset(rows, seed=0, directory=DATA_DIR):
+    """`rows` satırlık sentetik tahlil çalışma kitabının yolu (gerekirse üretilir).
+
+    Excel sayfa sınırı nedeniyle satır sayısı XLSX_MAX_ROWS ile sınırlıdır.
+    """
+    if rows > XLSX_MAX_ROWS:
+        raise ValueError(f"Bir çalışma sayfası en fazla {XLSX_MAX_ROWS} veri satırı alabilir: {rows}")
+    path = os.path.join(directory, f"lab-{rows}-{seed}.xlsx")
+    if not os.path.exists(path):
+        os.makedirs(directory, exist_ok=True)
+        write_lab_workbook(lab_frame(rows, seed=seed), path)
+    return path
@@ -0,0 +1,131 @@
+import colorsys
+import io
+
+import matplotlib.pyplot as plt
+import numpy as np
+import seaborn as sns
+
+# Styling
+colors = ['skyblue', 'plum']
+plt.style.use('seaborn-v0_8')
+plt.rcParams.update({'font.size': 10})  # Set default font size to 10
+
+# Grafikler yalnızca sade veriler (sayılar, histogramlar, kutu istatistikleri) alır;
+# böylece önbellek anahtarı ve ayrı süreçte çizim için DataFrame gerekmez.
+
+
+# Streamlit, bu genişlikten büyük görselleri her gösterimde yeniden boyutlandırıp
+# kodlar; PNG doğrudan bu sınıra sığacak çözünürlükte üretilir.
+MAX_WIDTH_PX = 2 * 730
+
+
+def figure_to_png(fig, dpi=200, max_width=MAX_WIDTH_PX):
+    """Figürü PNG baytlarına çevirir ve kapatır (st.pyplot ile aynı çözünürlük, en fazla `max_width`)."""
+    pad_inches = plt.rcParams["savefig.pad_inches"]
+    width_in = fig.get_tightbbox(fig.canvas.get_renderer()).width + 2 * pad_inches
+    dpi = min(dpi, (max_width - 2) / width_in)
+    buffer = io.BytesIO()
+    fig.savefig(buffer, format="png", bbox_inches="tight", dpi=dpi)
+    plt.close(fig)
+    return buffer.getvalue()
+
+
+def participation_pie(participants, non_participants):
+    # Pie chart için veri hazırla
+    participation_data = [participants, non_participants]
+    labels = ['Katılanlar', 'Katılmayanlar']
+
+    # Pie chart oluştur
+    fig_part, ax_part = plt.subplots(figsize=(4, 4))
+    ax_part.pie(participation_data, labels=labels, autopct='%1.1f%%', colors=colors)
+    ax_part.set_title("Yarışmaya Katılım Oranı", fontsize=10)
+    return fig_part
+
+
+def city_participation(participation_df):
+    # Stack bar chart oluştur
+    fig0, ax0 = plt.subplots(figsize=(16, 8))
+    participation_df.plot(kind='bar', stacked=True, ax=ax0, color=colors, width=0.8)
+
+    ax0.set_ylabel("Sporcu Sayısı", fontsize=10)
+    ax0.set_xlabel("İl", fontsize=10)
+    ax0.set_title("Her Şehirden Katılan ve Katılmayan Sporcu Sayısı", fontsize=10)
+    ax0.set_xticklabels(participation_df.index, rotation='vertical', ha="right", fontsize=10)
+
+    # Toplam sayıları göster
+    for c in ax0.containers:
+        ax0.bar_label(c, label_type='center')
+
+    # Gösterge etiketini düzenle
+    ax0.legend(title="Katılım Durumu")
+    return fig0
+
+
+def draw_box_plot(ax, stats, saturation=.75):
+    """Kutu istatistiklerinden (salon_data.box_stats) seaborn.boxplot görünümünde grafik çizer."""
+    palette = sns.color_palette('tab20', len(stats), desat=saturation)
+    lum = min(colorsys.rgb_to_hls(*color)[1] for color in palette) * .6 if stats else 0
+    linecolor = (lum, lum, lum)
+    positions = np.arange(len(stats))
+    artists = ax.bxp(
+        stats, positions=positions, widths=.8, capwidths=.4,
+        patch_artist=True, manage_ticks=False,
+        boxprops={"edgecolor": linecolor},
+        medianprops={"color": linecolor, "solid_capstyle": "butt"},
+        whiskerprops={"color": linecolor, "solid_capstyle": "butt"},
+        flierprops={"markeredgecolor": linecolor},
+        capprops={"color": linecolor},
+    )
+    for box, color in zip(artists["boxes"], palette):
+        box.set_facecolor(color)
+    ax.set_xticks(positions)
+    ax.set_xticklabels([stat["label"] for stat in stats])
+    ax.set_xlim(-.5, len(stats) - .5)
+    ax.xaxis.grid(False)
+
+
+def score_box_plot(stats, xlabel, vertical_labels=True):
+    fig, ax = plt.subplots(figsize=(16, 8))
+    draw_box_plot(ax, stats)
+    ax.set_ylabel("Toplam Puan", fontsize=10)
+    ax.set_xlabel(xlabel, fontsize=10)
+    if vertical_labels:
+        # Get current ticks and labels
+        ticks = ax.get_xticks()
+        labels = [label.get_text() for label in ax.get_xticklabels()]
+        # Set ticks and labels explicitly
+        ax.set_xticks(ticks)
+        ax.set_xticklabels(labels, rotation='vertical', ha="right", fontsize=10)
+    else:
+        ax.tick_params(axis='both', which='major', labelsize=10)
+    return fig
+
+
+def category_histogram(kategori, counts):
+    fig, ax = plt.subplots(figsize=(16, 8))
+    # Sadece 0'dan büyük puanlar: histogram hücresindeki puanlar, sayılarıyla ağırlıklandırılır
+    counts = np.asarray(counts)
+    scores = np.flatnonzero(counts)
+    n, bins, patches = ax.hist(scores, bins=21, weights=counts[scores], color='skyblue', edgecolor='white')
+
+    for count, patch in zip(n, patches):
+        ax.text(patch.get_x() + patch.get_width()/2, count,
+                s=int(count),
+                mouseover=True,
+                ha='center', va='bottom', rotation='vertical',
+                fontsize='medium',
+                )
+
+    ax.set_xticks(np.arange(0, 110, step=5))
+    ax.tick_params(axis='x', rotation=90, labelsize=10)
+    ax.set_yticks(np.arange(0, 10, step=10))
+    ax.tick_params(axis='y', labelsize=10)
+    ax.set_title(f"{kategori} Kategorisi Puan Dağılımı", fontsize=10)
+    ax.set_xlabel("Toplam Puan", fontsize=10)
+    ax.set_ylabel("Sporcu Sayısı", fontsize=10)
+    return fig
+
+
+def render_png(chart, *args):
+    """`chart` fonksiyonuyla figürü çizer ve PNG baytlarını döndürür."""
+    return figure_to_png(chart(*args))
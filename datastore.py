@@ -0,0 +1,56 @@
+import hashlib
+import json
+import os
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+# Ayrıştırılmış veri kopyalarının (Parquet sidecar) tutulduğu klasör
+CACHE_DIR = ".cache"
+
+# Parquet şema metadata'sında kaynak dosya bilgisinin tutulduğu anahtar
+SOURCE_META_KEY = b"source"
+
+
+def file_fingerprint(path):
+    """Dosyanın ucuz parmak izi: (mtime_ns, boyut). Her rerun'da hesaplanabilir."""
+    stat = os.stat(path)
+    return stat.st_mtime_ns, stat.st_size
+
+
+def file_digest(path, chunk_size=1 << 20):
+    """Dosya içeriğinin SHA-256 özeti. Parmak izi değiştiğinde içeriği doğrulamak için."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def sidecar_path(path, suffix=".parquet"):
+    """Kaynak dosyaya karşılık gelen sidecar dosyasının yolu."""
+    name = os.path.splitext(os.path.basename(path))[0]
+    return os.path.join(CACHE_DIR, name + suffix)
+
+
+def read_source_meta(sidecar):
+    """Sidecar'a yazılmış kaynak bilgisini döndürür; dosya yoksa veya bozuksa None."""
+    try:
+        metadata = pq.read_schema(sidecar).metadata or {}
+    except (OSError, pa.ArrowInvalid):
+        return None
+    raw = metadata.get(SOURCE_META_KEY)
+    return json.loads(raw) if raw else None
+
+
+def write_sidecar(df, sidecar, source_meta):
+    """DataFrame'i kaynak bilgisiyle birlikte Parquet olarak atomik yazar."""
+    os.makedirs(os.path.dirname(sidecar) or ".", exist_ok=True)
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    metadata = dict(table.schema.metadata or {})
+    metadata[SOURCE_META_KEY] = json.dumps(source_meta).encode("utf-8")
+    table = table.replace_schema_metadata(metadata)
+    tmp_path = f"{sidecar}.{os.getpid()}.tmp"
+    pq.write_table(table, tmp_path)
+    os.replace(tmp_path, sidecar)
+
@@ -0,0 +1,219 @@
+import io
+import os
+import re
+import sqlite3
+import threading
+from datetime import datetime
+
+import streamlit as st
+from PIL import Image
+
+from datastore import CACHE_DIR
+
+DOCUMENTS_DIR = "documents"
+CATALOG_PATH = os.path.join(CACHE_DIR, "documents.sqlite")
+
+DOCUMENT_TYPES = {
+    ".pdf": "PDF",
+    ".jpg": "Görsel",
+    ".jpeg": "Görsel",
+    ".png": "Görsel",
+}
+THUMBNAIL_SIZE = (160, 160)
+
+# Dosya adındaki anahtar kelimeden bölüm adı. Adda ilk geçen anahtar kelime kullanılır;
+# kısa kısaltmalar (MR, US, PET) yalnızca tam kelime olarak eşleşir.
+DEPARTMENTS = {
+    "Hematoloji": "Hematoloji",
+    "Onkoloji": "Onkoloji",
+    "Acil": "Acil",
+    "Beyin Cerrahi": "Beyin Cerrahi",
+    "Patoloji": "Patoloji",
+    "PET": "Nükleer Tıp",
+    "MR": "Radyoloji",
+    "US": "Radyoloji",
+}
+DEFAULT_DEPARTMENT = "Diğer"
+_DEPARTMENT_PATTERN = re.compile(
+    "|".join(rf"(?<![^\W\d_]){re.escape(keyword)}(?![^\W\d_])" for keyword in DEPARTMENTS),
+    re.IGNORECASE,
+)
+_DATE_PATTERN = re.compile(r"^(\d{8})-")
+_PDF_PAGE_PATTERN = re.compile(rb"/Type\s*/Page(?![a-zA-Z])")
+_PDF_COUNT_PATTERN = re.compile(rb"/Type\s*/Pages\b[^>]*?/Count\s+(\d+)|/Count\s+(\d+)[^>]*?/Type\s*/Pages\b")
+
+# Katalog yalnızca bir önbellektir; şema değişince tablo silinip yeniden doldurulur
+_SCHEMA_VERSION = 3
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS documents (
+    name TEXT PRIMARY KEY,
+    date TEXT,
+    department TEXT NOT NULL,
+    type TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    pages INTEGER,
+    thumbnail BLOB
+);
+CREATE INDEX IF NOT EXISTS documents_date ON documents (date);
+CREATE INDEX IF NOT EXISTS documents_department_date ON documents (department, date);
+"""
+
+
+def parse_date(file_name):
+    """Dosya adının `YYYYMMDD-` önekindeki tarih (ISO biçiminde); yoksa None."""
+    match = _DATE_PATTERN.match(file_name)
+    if not match:
+        return None
+    try:
+        return datetime.strptime(match.group(1), "%Y%m%d").date().isoformat()
+    except ValueError:
+        return None
+
+
+def parse_department(file_name):
+    """Dosya adından bölüm adı, ör. "20250219-Rapor (Hematoloji-Rituksimab).pdf" -> Hematoloji."""
+    stem = os.path.splitext(file_name)[0]
+    match = _DEPARTMENT_PATTERN.search(stem)
+    if not match:
+        return DEFAULT_DEPARTMENT
+    keyword = next(key for key in DEPARTMENTS if key.casefold() == match.group(0).casefold())
+    return DEPARTMENTS[keyword]
+
+
+def pdf_page_count(path):
+    """PDF sayfa sayısı; sayfa nesneleri sıkıştırılmış akışlardaysa sayfa ağacındaki
+    /Count değeri kullanılır. Belirlenemezse None."""
+    with open(path, "rb") as f:
+        data = f.read()
+    pages = len(_PDF_PAGE_PATTERN.findall(data))
+    if pages:
+        return pages
+    counts = [int(a or b) for a, b in _PDF_COUNT_PATTERN.findall(data)]
+    return max(counts) if counts else None
+
+
+def image_thumbnail(path, size=THUMBNAIL_SIZE):
+    """Görselin küçük JPEG önizlemesi."""
+    with Image.open(path) as image:
+        image.thumbnail(size)
+        buffer = io.BytesIO()
+        image.convert("RGB").save(buffer, format="JPEG", quality=80)
+    return buffer.getvalue()
+
+
+def index_document(path):
+    """Tek bir belgenin katalog satırı (dosya açılır; yalnızca yeni/değişen dosyalar için)."""
+    file_name = os.path.basename(path)
+    stat = os.stat(path)
+    doc_type = DOCUMENT_TYPES[os.path.splitext(file_name)[1].lower()]
+    pages, thumbnail = None, None
+    try:
+        if doc_type == "PDF":
+            pages = pdf_page_count(path)
+        else:
+            pages, thumbnail = 1, image_thumbnail(path)
+    except (OSError, ValueError):
+        # Bozuk dosya yine listelenir; sayfa sayısı ve önizleme boş kalır
+        pass
+    return (file_name, parse_date(file_name), parse_department(file_name), doc_type,
+            stat.st_size, stat.st_mtime_ns, pages, thumbnail)
+
+
+class DocumentCatalog:
+    """documents/ klasörünün SQLite kataloğu (.cache/ altında).
+
+    `sync` klasörü yalnızca listeler ve (boyut, mtime) değerlerini katalogla
+    karşılaştırır; yalnızca eklenen, değişen ve silinen dosyalar işlenir.
+    Tarih ve bölüm sorguları indekslerden yanıtlanır.
+    """
+
+    def __init__(self, directory=DOCUMENTS_DIR, path=CATALOG_PATH):
+        self.directory = directory
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        if self._connection.execute("PRAGMA user_version").fetchone()[0] != _SCHEMA_VERSION:
+            self._connection.executescript("DROP TABLE IF EXISTS documents;")
+            self._connection.execute(f"PRAGMA user_version = {_SCHEMA_VERSION}")
+        self._connection.executescript(_SCHEMA)
+        self._lock = threading.Lock()
+
+    def sync(self):
+        """Kataloğu klasörle eşitler; (eklenen/güncellenen, silinen) sayıları döndürür."""
+        current = {}
+        if os.path.isdir(self.directory):
+            with os.scandir(self.directory) as entries:
+                for entry in entries:
+                    if entry.is_file() and os.path.splitext(entry.name)[1].lower() in DOCUMENT_TYPES:
+                        stat = entry.stat()
+                        current[entry.name] = (stat.st_size, stat.st_mtime_ns)
+
+        with self._lock:
+            known = {name: (size, mtime_ns) for name, size, mtime_ns in
+                     self._connection.execute("SELECT name, size, mtime_ns FROM documents")}
+        changed = [name for name, signature in current.items() if known.get(name) != signature]
+        removed = [name for name in known if name not in current]
+        if not changed and not removed:
+            return 0, 0
+
+        rows = []
+        for name in changed:
+            try:
+                rows.append(index_document(os.path.join(self.directory, name)))
+            except FileNotFoundError:
+                # Listeleme ile okuma arasında silinmiş
+                removed.append(name)
+        with self._lock, self._connection:
+            self._connection.executemany(
+                "INSERT OR REPLACE INTO documents VALUES (?, ?, ?, ?, ?, ?, ?, ?)", rows)
+            self._connection.executemany(
+                "DELETE FROM documents WHERE name = ?", [(name,) for name in removed])
+        return len(rows), len(removed)
+
+    def departments(self):
+        with self._lock:
+            return [row[0] for row in self._connection.execute(
+                "SELECT DISTINCT department FROM documents ORDER BY department")]
+
+    def date_range(self):
+        """Katalogdaki en eski ve en yeni belge tarihi (ISO); katalog boşsa (None, None)."""
+        with self._lock:
+            return self._connection.execute("SELECT MIN(date), MAX(date) FROM documents").fetchone()
+
+    def query(self, start=None, end=None, departments=None, include_undated=False, with_thumbnails=False):
+        """Tarih aralığı (ISO, iki uç dahil) ve bölümlere göre belgeler, tarih sırasıyla.
+
+        Tarihsiz belgeler tarih filtresi verilmediğinde ya da `include_undated`
+        ile listelenir; sonda yer alırlar.
+        """
+        columns = "name, date, department, type, size, pages"
+        if with_thumbnails:
+            columns += ", thumbnail"
+        conditions, params = [], []
+        date_conditions = []
+        if start is not None:
+            date_conditions.append("date >= ?")
+            params.append(start)
+        if end is not None:
+            date_conditions.append("date <= ?")
+            params.append(end)
+        if date_conditions:
+            clause = " AND ".join(date_conditions)
+            conditions.append(f"(({clause}) OR date IS NULL)" if include_undated else clause)
+        if departments is not None:
+            conditions.append(f"department IN ({', '.join('?' * len(departments))})")
+            params.extend(departments)
+        sql = f"SELECT {columns} FROM documents"
+        if conditions:
+            sql += " WHERE " + " AND ".join(conditions)
+        sql += " ORDER BY date IS NULL, date, name"
+        with self._lock:
+            cursor = self._connection.execute(sql, params)
+            names = [description[0] for description in cursor.description]
+            return [dict(zip(names, row)) for row in cursor]
+
+
+@st.cache_resource(show_spinner=False)
+def get_document_catalog(directory=DOCUMENTS_DIR):
+    """Süreç genelinde paylaşılan belge kataloğu."""
+    return DocumentCatalog(directory)
@@ -0,0 +1,127 @@
+import html
+import io
+import os
+import shutil
+import threading
+from urllib.parse import quote
+
+import streamlit as st
+from PIL import Image
+
+from profiler import section
+
+DOCUMENTS_DIR = "documents"
+# Streamlit statik dosya sunumu (server.enableStaticServing) uygulama klasöründeki
+# static/ dizinini /app/static altında yayınlar. Tornado'nun statik dosya işleyicisi
+# dosyaları parça parça akıtır ve Range isteklerini destekler; PDF görüntüleyiciler
+# sayfaları bu sayede ihtiyaç oldukça yükler.
+STATIC_DIR = "static"
+STATIC_URL = "app/static"
+STATIC_DOCUMENTS = os.path.join(STATIC_DIR, DOCUMENTS_DIR)
+
+# Önizleme görsellerinin en büyük genişliği (Streamlit'in en geniş içerik alanı)
+PREVIEW_WIDTH = 2 * 730
+
+MIME_TYPES = {
+    ".pdf": "application/pdf",
+    ".jpg": "image/jpeg",
+    ".jpeg": "image/jpeg",
+    ".png": "image/png",
+}
+
+
+def static_serving_enabled():
+    return bool(st.get_option("server.enableStaticServing"))
+
+
+def publish_document(file_name, directory=DOCUMENTS_DIR):
+    """Belgeyi static/documents altında yayınlar; başarılıysa True.
+
+    Tornado, static/ dışına çıkan sembolik bağlantıları sunmaz; bu yüzden dosya
+    sabit bağlantı (hard link) ile, olmazsa kopyalanarak yayınlanır. Kaynak dosya
+    değiştiyse (farklı inode ya da boyut/mtime) yayınlanan kopya yenilenir.
+    """
+    if not static_serving_enabled():
+        return False
+    source = os.path.join(directory, file_name)
+    target = os.path.join(STATIC_DOCUMENTS, file_name)
+    try:
+        if os.path.exists(target):
+            if os.path.samefile(source, target):
+                return True
+            source_stat, target_stat = os.stat(source), os.stat(target)
+            if (source_stat.st_size, source_stat.st_mtime_ns) == (target_stat.st_size, target_stat.st_mtime_ns):
+                return True
+        os.makedirs(STATIC_DOCUMENTS, exist_ok=True)
+        tmp_path = f"{target}.{threading.get_ident()}.tmp"
+        try:
+            os.link(source, tmp_path)
+        except OSError:
+            # Farklı dosya sistemi ya da sabit bağlantı desteklenmiyor
+            shutil.copy2(source, tmp_path)
+        os.replace(tmp_path, target)
+    except OSError:
+        return False
+    return True
+
+
+def document_url(file_name):
+    """Belgenin akış halinde (Range destekli) sunulduğu göreli adres."""
+    return f"{STATIC_URL}/{DOCUMENTS_DIR}/{quote(file_name)}"
+
+
+def mime_type(file_name):
+    return MIME_TYPES.get(os.path.splitext(file_name)[1].lower(), "application/octet-stream")
+
+
+@st.cache_data(show_spinner=False, max_entries=32)
+def image_preview(path, mtime_ns, max_width=PREVIEW_WIDTH):
+    """Görselin küçültülmüş önizlemesi (JPEG/PNG baytları). Dosya değişince yenilenir."""
+    with Image.open(path) as image:
+        image.thumbnail((max_width, max_width * 4))
+        buffer = io.BytesIO()
+        if image.mode in ("RGBA", "LA", "P"):
+            # Saydamlık içeren görseller PNG olarak kalır
+            image.save(buffer, format="PNG", optimize=True)
+        else:
+            image.convert("RGB").save(buffer, format="JPEG", quality=85, optimize=True)
+    return buffer.getvalue()
+
+
+def download_link(label, file_name):
+    """Orijinal dosyayı statik sunumdan akış halinde indiren bağlantı."""
+    st.markdown(
+        f'<a href="{html.escape(document_url(file_name), quote=True)}" '
+        f'download="{html.escape(file_name, quote=True)}" target="_blank">{html.escape(label)}</a>',
+        unsafe_allow_html=True,
+    )
+
+
+def show_document(file_name, directory=DOCUMENTS_DIR):
+    """PDF'i akış halinde iframe içinde, görseli önbellekli önizleme olarak gösterir."""
+    file_path = os.path.join(directory, file_name)
+    streamed = publish_document(file_name, directory)
+
+    if file_name.lower().endswith(".pdf"):
+        if streamed:
+            st.markdown(
+                f'<iframe src="{html.escape(document_url(file_name), quote=True)}" width="700" height="900" type="application/pdf"></iframe>',
+                unsafe_allow_html=True,
+            )
+            download_link("PDF dosyasını indir", file_name)
+        else:
+            # Statik sunum yoksa PDF yalnızca indirilebilir (base64 iframe gönderilmez)
+            st.info("PDF önizlemesi için statik dosya sunumu (server.enableStaticServing) açık olmalıdır.")
+            with open(file_path, "rb") as f:
+                st.download_button(label="PDF dosyasını indir", data=f.read(),
+                                   file_name=file_name, mime=mime_type(file_name))
+    else:
+        with section("görsel önizleme"):
+            preview = image_preview(file_path, os.stat(file_path).st_mtime_ns)
+            st.image(preview, caption=file_name, use_container_width=True)
+        if streamed:
+            download_link("Görsel dosyasını indir (orijinal)", file_name)
+        else:
+            with open(file_path, "rb") as f:
+                st.download_button(label="Görsel dosyasını indir", data=f.read(),
+                                   file_name=file_name, mime=mime_type(file_name))
@@ -0,0 +1,190 @@
+"""Tüm tahliller için toplu anormallik ve eğilim taraması.
+
+Hesaplar tahlil indeksinin (lab_data.TestIndex) bitişik dizileri üzerinde tek
+geçişte yapılır; tahlil başına Python döngüsü yoktur. Tahlil sınırları
+`offsets` dizisinden türetilen grup numaralarıyla belirlenir:
+
+* referans dışı: sonuç, ayrıştırılmış `Referans Değeri` aralığının dışında
+* kayan z skoru: sonucun aynı tahlilin önceki `window` ölçümüne göre z skoru
+* yüzde değişim: aynı tahlilin bir önceki ölçümüne göre
+* eğilim: son `recent` ölçümün gün başına doğrusal eğimi (en küçük kareler)
+
+Sayısal olmayan sonuçlar (NaN) hesaplara katılmaz.
+"""
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from lab_data import REFERENCE_OK
+
+# Kayan z skorunun penceresi ve anlamlı sayılması için gereken en az önceki ölçüm
+ZSCORE_WINDOW = 10
+ZSCORE_MIN_PERIODS = 3
+# Ani sapma eşiği (|z|) ve skora katılan en büyük |z|; neredeyse sabit bir
+# geçmişten sonraki ilk farklı sonuç çok büyük z verir, skoru tek başına belirlemesin
+ZSCORE_THRESHOLD = 3.0
+ZSCORE_CAP = 10.0
+# Özet tablosunda "son sonuçlar" sayılan ölçüm sayısı
+RECENT_DRAWS = 5
+
+_DAY = np.timedelta64(1, "D")
+
+
+@dataclass(frozen=True)
+class AnomalyReport:
+    """Satır bazında işaretler (indeksin satır sırasıyla) ve tahlil bazında özet.
+
+    `summary` tahlilleri anormallik skoruna göre azalan sırada listeler. Skor,
+    son ölçümlerdeki referans dışı sonuç oranı ile en büyük |z| değerinin
+    (ZSCORE_CAP ile sınırlı) ZSCORE_THRESHOLD'a oranının toplamıdır.
+    """
+    out_of_range: np.ndarray
+    zscores: np.ndarray
+    pct_changes: np.ndarray
+    summary: pd.DataFrame
+
+
+def _group_numbers(offsets):
+    # Satırın ait olduğu tahlil numarası
+    return np.repeat(np.arange(len(offsets) - 1), np.diff(offsets))
+
+
+def rolling_zscores(values, offsets, window=ZSCORE_WINDOW, min_periods=ZSCORE_MIN_PERIODS):
+    """Her sonucun aynı tahlilin önceki `window` sonucuna göre z skoru.
+
+    Pencere toplamları önek toplamlarının farkıyla bulunur. Sayısal kararlılık
+    için değerler önce tahlil ortalamasından çıkarılır. Önceki ölçüm sayısı
+    `min_periods`'tan azsa ya da pencere sabitse NaN.
+    """
+    groups = _group_numbers(offsets)
+    counts = np.diff(offsets)
+    means = np.bincount(groups, weights=values, minlength=len(counts)) / np.maximum(counts, 1)
+    centered = values - means[groups]
+
+    squared = centered ** 2
+    spreads = np.bincount(groups, weights=squared, minlength=len(counts)) / np.maximum(counts, 1)
+    sums = np.concatenate([[0.0], np.cumsum(centered)])
+    squares = np.concatenate([[0.0], np.cumsum(squared)])
+    rows = np.arange(len(values))
+    starts = np.maximum(offsets[groups], rows - window)
+    n = rows - starts
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        mean = (sums[rows] - sums[starts]) / n
+        variance = (squares[rows] - squares[starts] - n * mean ** 2) / (n - 1)
+        std = np.sqrt(np.clip(variance, 0, None))
+        zscores = (centered - mean) / std
+    # Önek toplamlarının yuvarlama hatası tahlilin varyansıyla orantılıdır; sabit
+    # pencerede (varyans ~ 0) bu hata z üretmesin
+    flat = ~(variance > 1e-8 * spreads[groups])
+    zscores[(n < min_periods) | flat] = np.nan
+    return zscores
+
+
+def pct_changes(values, offsets):
+    """Aynı tahlilin bir önceki sonucuna göre yüzde değişim; tahlilin ilk sonucu NaN."""
+    changes = np.full(len(values), np.nan)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        changes[1:] = (values[1:] - values[:-1]) / np.abs(values[:-1]) * 100
+    changes[offsets[:-1][np.diff(offsets) > 0]] = np.nan
+    changes[~np.isfinite(changes)] = np.nan
+    return changes
+
+
+def trend_slopes(dates, values, offsets, recent=RECENT_DRAWS):
+    """Her tahlilin son `recent` sonucunun gün başına eğimi; tek günde ölçülmüşse NaN."""
+    groups = _group_numbers(offsets)
+    ends = offsets[1:]
+    rows = np.arange(len(values))
+    selected = rows >= ends[groups] - recent
+    g = groups[selected]
+    # Günler tahlilin son ölçümüne göre; büyük sayılarla kare toplamı alınmaz
+    last_dates = dates[np.maximum(ends - 1, 0)]
+    t = (dates[selected] - last_dates[g]) / _DAY
+    v = values[selected]
+
+    size = len(offsets) - 1
+    n = np.bincount(g, minlength=size)
+    sum_t, sum_v = np.bincount(g, t, size), np.bincount(g, v, size)
+    sum_tt, sum_tv = np.bincount(g, t * t, size), np.bincount(g, t * v, size)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        denominator = n * sum_tt - sum_t ** 2
+        slopes = (n * sum_tv - sum_t * sum_v) / denominator
+    slopes[(n < 2) | (np.abs(denominator) < 1e-12)] = np.nan
+    return slopes
+
+
+def build_anomaly_report(index, window=ZSCORE_WINDOW, recent=RECENT_DRAWS):
+    """Tahlil indeksinin tüm serileri için işaretler ve özet tablo."""
+    size = len(index)
+    valid = np.isfinite(index.values)
+    # Sayısal olmayan sonuçlar çıkarılır; tahlil sınırları sıkıştırılmış dizilere taşınır
+    groups_all = _group_numbers(index.offsets)
+    offsets = np.zeros(size + 1, dtype=np.int64)
+    np.cumsum(np.bincount(groups_all[valid], minlength=size), out=offsets[1:])
+    groups = groups_all[valid]
+    dates = index.dates[valid]
+    values = index.values[valid]
+    lows, highs = index.lows[valid], index.highs[valid]
+    checked = index.statuses[valid] == REFERENCE_OK
+
+    out_of_range = checked & ((values < lows) | (values > highs))
+    zscores = rolling_zscores(values, offsets, window)
+    changes = pct_changes(values, offsets)
+    slopes = trend_slopes(dates, values, offsets, recent)
+
+    counts = np.diff(offsets)
+    ends = offsets[1:]
+    recent_rows = np.arange(len(values)) >= ends[groups] - recent
+    recent_counts = np.bincount(groups[recent_rows], minlength=size)
+    recent_checked = np.bincount(groups[recent_rows], checked[recent_rows], size)
+    recent_out = np.bincount(groups[recent_rows], out_of_range[recent_rows], size)
+    # Son ölçümlerdeki en büyük |z| (diğer satırlar 0 sayılır)
+    abs_z = np.where(recent_rows & np.isfinite(zscores), np.abs(zscores), 0)
+    max_abs_z = np.zeros(size)
+    np.maximum.at(max_abs_z, groups, abs_z)
+    sudden = np.bincount(groups[recent_rows], abs_z[recent_rows] >= ZSCORE_THRESHOLD, size).astype(np.int64)
+
+    has_values = counts > 0
+    last = np.maximum(ends - 1, 0)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        out_fraction = recent_out / recent_checked
+    score = np.nan_to_num(out_fraction) + np.minimum(max_abs_z, ZSCORE_CAP) / ZSCORE_THRESHOLD
+
+    summary = pd.DataFrame({
+        "Tahlil": index.names,
+        "Skor": score,
+        "Ölçüm": counts,
+        "Son Tarih": np.where(has_values, dates[last], np.datetime64("NaT")),
+        "Son Sonuç": np.where(has_values, values[last], np.nan),
+        "Birim": index.units,
+        "Referans": index.references,
+        "Son Ölçümde Referans Dışı": np.where(has_values, out_of_range[last], False),
+        f"Son {recent} Ölçümde Referans Dışı (%)": out_fraction * 100,
+        f"Son {recent} Ölçümde En Büyük |z|": np.where(max_abs_z > 0, max_abs_z, np.nan),
+        "Ani Sapma": sudden,
+        "Son Değişim (%)": np.where(has_values, changes[last], np.nan),
+        "Eğim (gün başına)": slopes,
+    })
+    summary = summary[has_values & (recent_counts > 0)].sort_values("Skor", ascending=False, kind="stable")
+
+    # Satır bazındaki sonuçlar indeksin satır düzenine geri yerleştirilir
+    def expand(array, fill):
+        full = np.full(len(valid), fill, dtype=array.dtype)
+        full[valid] = array
+        return full
+
+    return AnomalyReport(
+        out_of_range=expand(out_of_range, False),
+        zscores=expand(zscores, np.nan),
+        pct_changes=expand(changes, np.nan),
+        summary=summary.reset_index(drop=True),
+    )
+
+
+@st.cache_data(show_spinner=False, max_entries=4)
+def anomaly_report(_index, version, window=ZSCORE_WINDOW, recent=RECENT_DRAWS):
+    """Veri sürümü ve pencere boyutları başına bir kez hesaplanan tarama."""
+    return build_anomaly_report(_index, window, recent)
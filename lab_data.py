@@ -0,0 +1,335 @@
+import re
+import unicodedata
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+from openpyxl import load_workbook
+
+from datastore import file_fingerprint, read_source_meta, sidecar_path, write_sidecar
+from profiler import section
+
+LAB_PATH = "dataset/melike-tahlil-merged_final.xlsx"
+LAB_SHEET = "Sheet1"
+DATE_FORMAT = "%d.%m.%Y %H:%M:%S"
+
+# Tekrarlanan metin sütunları kategorik olarak saklanır
+CATEGORY_COLUMNS = ["Tahlil", "Sonuç Birimi", "Referans Değeri", "Test"]
+
+
+def clean_text(text):
+    if isinstance(text, str):
+        text = re.sub(r'[\x00-\x1F\x7F-\x9F\u200B-\u200D\uFEFF\u202C]+', '', text)
+        text = unicodedata.normalize('NFKC', text)
+    return text
+
+
+def dataset_version(path=LAB_PATH):
+    """Tahlil çalışma kitabının sürüm anahtarı."""
+    mtime_ns, size = file_fingerprint(path)
+    return f"{mtime_ns}-{size}"
+
+
+def _row_signature(row):
+    # Satırı JSON'a yazılabilir, karşılaştırılabilir biçime getirir
+    return [None if value is None else str(value) for value in row]
+
+
+def _read_sheet_rows(path, first_row, sheet_name=LAB_SHEET):
+    """Başlığı ve `first_row` (1 tabanlı, başlık = 1) itibarıyla satırları okur.
+
+    openpyxl salt-okunur modda sayfayı akış halinde okur; atlanan satırlar için
+    hücre nesnesi oluşturulmaz.
+    """
+    with section("Excel okuma"):
+        wb = load_workbook(path, read_only=True, data_only=True)
+        try:
+            ws = wb[sheet_name]
+            header = next(ws.iter_rows(min_row=1, max_row=1, values_only=True))
+            rows = list(ws.iter_rows(min_row=first_row, values_only=True))
+        finally:
+            wb.close()
+    # Sayfa sonundaki boş satırlar veri sayılmaz
+    while rows and all(value is None for value in rows[-1]):
+        rows.pop()
+    return list(header), rows
+
+
+def normalize_lab_rows(header, rows):
+    """Ham satırları tarih, metin ve kategorik tipleriyle normalize eder."""
+    df = pd.DataFrame(rows, columns=header)
+    df['Tarih'] = pd.to_datetime(df['Tarih'], format=DATE_FORMAT)
+    df['Tarih2'] = df['Tarih'].dt.strftime('%Y-%m-%d')
+    df['Sonuç'] = pd.to_numeric(df['Sonuç'], errors='coerce')
+    # clean_text her farklı değer için bir kez çalışır, satır başına değil
+    with section("clean_text"):
+        df['Tahlil'] = df['Tahlil'].map({name: clean_text(name) for name in df['Tahlil'].unique()})
+    for col in CATEGORY_COLUMNS:
+        df[col] = df[col].astype('category')
+    return df
+
+
+def _sort_by_date(df):
+    return df.sort_values(by='Tarih', ascending=True, kind='stable', ignore_index=True)
+
+
+def _append_rows(df, new_df):
+    """Yeni satırları sıralı kopyaya ekler; tarih sırası bozulmuyorsa yeniden sıralamaz."""
+    in_order = df.empty or new_df.empty or new_df['Tarih'].min() >= df['Tarih'].max()
+    new_df = _sort_by_date(new_df)
+    combined = pd.concat([df, new_df], ignore_index=True)
+    for col in CATEGORY_COLUMNS:
+        combined[col] = combined[col].astype('category')
+    return combined if in_order else _sort_by_date(combined)
+
+
+def ingest_lab_results(path=LAB_PATH, sheet_name=LAB_SHEET):
+    """Çalışma kitabını normalize edilmiş, sıralı Parquet kopyasıyla eşitler.
+
+    Çalışma kitabının sonuna eklenen satırlar varsa yalnızca onlar işlenir.
+    Daha önce alınmış son satırın imzası tutmuyorsa (satır silinmiş ya da
+    değiştirilmişse) kopya baştan oluşturulur.
+    """
+    mtime_ns, size = file_fingerprint(path)
+    sidecar = sidecar_path(path)
+    meta = read_source_meta(sidecar)
+
+    if meta and meta.get("fingerprint") == [mtime_ns, size] and meta.get("sheet") == sheet_name:
+        return pd.read_parquet(sidecar)
+
+    df = None
+    if meta and meta.get("sheet") == sheet_name and meta.get("rows"):
+        ingested = meta["rows"]
+        # Son alınan satırdan itibaren oku: ilk satır imza kontrolü, kalanlar yeni satırlar
+        header, rows = _read_sheet_rows(path, ingested + 1, sheet_name)
+        if (header == meta.get("header") and rows
+                and _row_signature(rows[0]) == meta.get("last_row")):
+            df = pd.read_parquet(sidecar)
+            new_rows = rows[1:]
+            if new_rows:
+                df = _append_rows(df, normalize_lab_rows(header, new_rows))
+            total = ingested + len(new_rows)
+            last_row = rows[-1]
+
+    if df is None:
+        header, rows = _read_sheet_rows(path, 2, sheet_name)
+        df = _sort_by_date(normalize_lab_rows(header, rows))
+        total = len(rows)
+        last_row = rows[-1] if rows else None
+
+    write_sidecar(df, sidecar, {
+        "path": path,
+        "sheet": sheet_name,
+        "fingerprint": [mtime_ns, size],
+        "header": header,
+        "rows": total,
+        "last_row": _row_signature(last_row) if last_row is not None else None,
+    })
+    return df
+
+
+@st.cache_data(show_spinner=False, max_entries=4)
+def _load_lab_results(path, version):
+    # Sürüm yalnızca önbellek anahtarı olarak kullanılır
+    return ingest_lab_results(path)
+
+
+def load_lab_results(path=LAB_PATH):
+    """Tarihe göre sıralı, temizlenmiş tahlil tablosunu önbellekten döndürür."""
+    return _load_lab_results(path, dataset_version(path))
+
+
+#################################################################################
+# Tahlil başına zaman serisi indeksi: her tahlilin noktaları bitişik NumPy dilimleri
+
+# Referans aralığı ayrıştırma durumu
+REFERENCE_OK = 0
+REFERENCE_MISSING = 1
+REFERENCE_UNPARSED = 2
+
+# "3,5 - 5,1" ya da "0.99 - 1" biçimindeki aralıklar
+_REFERENCE_PATTERN = r"^\s*([-+]?\d+(?:[.,]\d+)?)\s*-\s*([-+]?\d+(?:[.,]\d+)?)\s*$"
+
+
+def parse_reference_ranges(references):
+    """Referans metinlerini (alt, üst, durum) dizilerine ayrıştırır.
+
+    Ayrıştırma her farklı metin için bir kez yapılır. Sayısal olmayan
+    aralıklar (ör. "NEGATİF - 0") REFERENCE_UNPARSED, boş değerler
+    REFERENCE_MISSING durumunu alır; alt ve üst değerleri NaN olur.
+    """
+    references = pd.Series(references, dtype="category")
+    categories = references.cat.categories.astype(str)
+    bounds = categories.str.extract(_REFERENCE_PATTERN)
+    lows = np.append(bounds[0].str.replace(",", ".").astype(float).to_numpy(), np.nan)
+    highs = np.append(bounds[1].str.replace(",", ".").astype(float).to_numpy(), np.nan)
+    statuses = np.append(np.where(bounds[0].isna(), REFERENCE_UNPARSED, REFERENCE_OK), REFERENCE_MISSING)
+    # Kategori kodu -1 (boş değer) son elemana, yani NaN/REFERENCE_MISSING'e denk gelir
+    codes = references.cat.codes.to_numpy()
+    return lows[codes], highs[codes], statuses[codes].astype(np.int8)
+
+
+@dataclass(frozen=True)
+class TestSeries:
+    """Tek bir tahlilin tarih sıralı sonuçları ve grafikte kullanılan referans aralığı."""
+
+    name: str
+    unit: object
+    reference: object
+    reference_low: object
+    reference_high: object
+    reference_status: int
+    dates: np.ndarray
+    values: np.ndarray
+    lows: np.ndarray
+    highs: np.ndarray
+
+
+@dataclass(frozen=True)
+class TestIndex:
+    """Tahlil başına bitişik diziler (CSR düzeni).
+
+    i. tahlilin sonuçları `dates[offsets[i]:offsets[i + 1]]` aralığındadır ve tarih
+    sıralıdır. Birim ve referans metni tahlilin ilk sonucundan alınır; satır bazındaki
+    referans aralıkları `lows`/`highs`/`statuses` dizilerinde tutulur.
+    """
+
+    names: list
+    positions: dict
+    offsets: np.ndarray
+    dates: np.ndarray
+    values: np.ndarray
+    lows: np.ndarray
+    highs: np.ndarray
+    statuses: np.ndarray
+    units: list
+    references: list
+
+    def __len__(self):
+        return len(self.names)
+
+    def __contains__(self, name):
+        return name in self.positions
+
+    def get(self, name):
+        """Tahlilin serisi; diziler kopyalanmaz, indeksin dilimleridir."""
+        i = self.positions[name]
+        rows = slice(self.offsets[i], self.offsets[i + 1])
+        first = self.offsets[i]
+        ok = self.statuses[first] == REFERENCE_OK
+        return TestSeries(
+            name=name,
+            unit=self.units[i],
+            reference=self.references[i],
+            reference_low=float(self.lows[first]) if ok else None,
+            reference_high=float(self.highs[first]) if ok else None,
+            reference_status=int(self.statuses[first]),
+            dates=self.dates[rows],
+            values=self.values[rows],
+            lows=self.lows[rows],
+            highs=self.highs[rows],
+        )
+
+
+def lttb_indices(x, y, n_out, priority=None):
+    """Largest-Triangle-Three-Buckets ile seçilen `n_out` noktanın sırası.
+
+    İlk ve son nokta her zaman korunur; aradaki her kovadan, bir önceki seçilen
+    nokta ve sonraki kovanın ortalamasıyla en büyük üçgeni kuran nokta seçilir.
+    `priority` verilirse, pozitif öncelikli noktası olan kovadan üçgen yerine
+    en yüksek öncelikli nokta seçilir (nokta sayısı yine `n_out`).
+    """
+    n = len(x)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.int64)
+    # Sonraki kovaların ortalamaları bir kerede hesaplanır (son kova yalnızca son nokta)
+    counts = np.diff(np.append(edges, n))
+    next_x = np.add.reduceat(x, edges) / counts
+    next_y = np.add.reduceat(y, edges) / counts
+    if priority is not None:
+        priority = np.asarray(priority, dtype=np.float64)
+        prioritized = np.maximum.reduceat(priority, edges[:-1]) > 0
+    selected = np.empty(n_out, dtype=np.int64)
+    selected[0], selected[-1] = 0, n - 1
+    a = 0
+    for i in range(n_out - 2):
+        start, end = edges[i], edges[i + 1]
+        if priority is not None and prioritized[i]:
+            a = start + int(np.argmax(priority[start:end]))
+            selected[i + 1] = a
+            continue
+        area = np.abs((x[a] - next_x[i + 1]) * (y[start:end] - y[a])
+                      - (x[a] - x[start:end]) * (next_y[i + 1] - y[a]))
+        a = start + int(np.argmax(area))
+        selected[i + 1] = a
+    return selected
+
+
+def downsample_indices(series, max_points):
+    """Seriyi en fazla `max_points` noktaya indiren sıralar.
+
+    Referans aralığı dışında sonuç içeren LTTB kovalarından aralığın en çok
+    dışına taşan sonuç seçilir; seçime ayrıca en küçük ve en büyük değer
+    eklenir. Böylece aykırı değerler seyreltmede kaybolmaz, nokta sayısı da
+    sürekli referans dışı bir tahlilde bile sınırı aşmaz. Eksik (NaN) sonuçlar
+    atlanır.
+    """
+    valid = np.flatnonzero(~np.isnan(series.values))
+    if len(valid) <= max_points:
+        return valid
+    x = series.dates[valid].astype("datetime64[ns]").astype(np.int64)
+    y = series.values[valid]
+    # Aralık dışına taşma miktarı; aralık içi ve referansı ayrıştırılamayan sonuçlar 0
+    with np.errstate(invalid="ignore"):
+        excess = np.fmax(series.lows[valid] - y, y - series.highs[valid])
+    excess = np.clip(np.nan_to_num(excess, nan=0.0), 0, None)
+    # İki nokta en küçük ve en büyük değere ayrılır
+    keep = valid[lttb_indices(x, y, max_points - 2, priority=excess)]
+    extremes = valid[[np.argmin(y), np.argmax(y)]]
+    return np.union1d(keep, extremes)
+
+
+def build_test_index(df):
+    """Tarih sıralı tahlil tablosundan tahlil başına zaman serisi indeksi kurar.
+
+    Tahliller çalışma kitabındaki ilk görülme sırasıyla (ID) dizilir.
+    """
+    df = df[df["Tahlil"].notna()]
+    tahlil = df["Tahlil"].astype("category")
+    first_ids = df.groupby(tahlil, observed=True, sort=False)["ID"].min().sort_values(kind="stable")
+    names = list(first_ids.index)
+    positions = {name: i for i, name in enumerate(names)}
+
+    # Kategori sırası tahlil sırasına eşitlenince kodlar doğrudan tahlil numarası olur.
+    # Satırlar tahlile göre kararlı sıralanır; tahlil içindeki tarih sırası korunur.
+    group = pd.Categorical(tahlil, categories=names).codes.astype(np.int64)
+    order = np.argsort(group, kind="stable")
+    offsets = np.zeros(len(names) + 1, dtype=np.int64)
+    np.cumsum(np.bincount(group, minlength=len(names)), out=offsets[1:])
+
+    lows, highs, statuses = parse_reference_ranges(df["Referans Değeri"])
+    firsts = order[offsets[:-1]]
+    units = df["Sonuç Birimi"].to_numpy(dtype=object)[firsts]
+    references = df["Referans Değeri"].to_numpy(dtype=object)[firsts]
+    return TestIndex(
+        names=names,
+        positions=positions,
+        offsets=offsets,
+        dates=df["Tarih"].to_numpy()[order],
+        values=df["Sonuç"].to_numpy(dtype=np.float64)[order],
+        lows=lows[order],
+        highs=highs[order],
+        statuses=statuses[order],
+        units=[None if pd.isna(unit) else unit for unit in units],
+        references=[None if pd.isna(ref) else ref for ref in references],
+    )
+
+
+@st.cache_data(show_spinner=False, max_entries=4)
+def test_index(_df, version):
+    """Veri sürümü başına bir kez kurulan tahlil indeksi."""
+    return build_test_index(_df)
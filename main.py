@@ -1,46 +1,138 @@
 import streamlit as st
-import pandas as pd
-import matplotlib.pyplot as plt
-import seaborn as sns
-import numpy as np
-import os
 
-# Create a folder for figures if it doesn't exist
-os.makedirs("figures", exist_ok=True)
+import vega_charts
+from assets import logo_path
+from profiler import profiled_fragment, section, show_profile_panel, start_run
+from render_cache import submit_render
+from salon_archive import (city_participation, competition_label, filtered_results, list_partitions,
+                           partition_version, refresh_partition, season_cube)
+from salon_data import box_stats_by
+from salon_ranking import RANK_METHODS, RANK_SCOPES, rank_column, season_rankings
 
-# Styling
-colors = ['skyblue', 'plum']
-plt.style.use('seaborn-v0_8')
-plt.rcParams.update({'font.size': 10})  # Set default font size to 10
+# Bölüm süre ölçümü (?profile=1 ile açılır, sonuçlar kenar çubuğunda)
+start_run()
 
 # Logo ve başlık yerleşimi
 col1, col2, col3 = st.columns([1,2,1])
 with col2:
-    st.image("https://tgtof.org.tr/wp-content/uploads/2019/08/TGTOF_navy.png", width=200)
+    # Logo yerel kopyadan gösterilir (assets.py); sayfa yüklenirken uzak sunucuya gidilmez
+    st.image(logo_path(), width=200)
 
-# Veriyi yükle
-df = pd.read_csv("dataset/2025salonfinal.csv")
+# Sezon seçimi: her sezon/müsabaka dataset/archive altında ayrı bir bölümdür (salon_archive.py)
+partitions = list_partitions()
+if not partitions:
+    st.error("dataset/archive altında müsabaka bulunamadı. Sonuçları `python salon_archive.py` ile aktarın.")
+    st.stop()
+season, competition = st.sidebar.selectbox(
+    "Sezon", partitions, format_func=lambda p: competition_label(*p))
+with section("veri yükleme"):
+    # Kaynak CSV değiştiyse bölüm yeniden aktarılır; sürüm anahtarı da değişir
+    if refresh_partition(season, competition):
+        st.toast(f"{competition_label(season, competition)} sonuçları güncellendi.")
+    version = partition_version(season, competition)
+# (İL, KATEGORİ, KULÜB) hücrelerine göre önceden hesaplanmış sayımlar ve puan histogramları.
+# Yalnızca seçilen bölümün küp sütunları okunur.
+with section("istatistik küpü"):
+    cube = season_cube(season, competition, version)
+title = competition_label(season, competition)
 
-st.title("2025 Salon Finali Sonuç Analizi")
-st.markdown("""
-Bu gösterge paneli, Türkiye Geleneksel Türk Okçuluğu 2025 Salon Puta Finali spor müsabakası sonuçlarının genel bir görünümünü ve analizini sunar.
+st.title(f"{title} Finali Sonuç Analizi")
+st.markdown(f"""
+Bu gösterge paneli, Türkiye Geleneksel Türk Okçuluğu {title} Puta Finali spor müsabakası sonuçlarının genel bir görünümünü ve analizini sunar.
 Veriyi filtreleyebilir, özet istatistikleri görebilir ve görselleştirmelerle içgörüler elde edebilirsiniz.
 """)
 
 #################################################################################
 # Kenar çubuğu filtreleri
 st.sidebar.header("Veriyi Filtrele")
-cities = st.sidebar.multiselect("İl Seçiniz", options=df["İL"].unique(), default=df["İL"].unique())
-categories = st.sidebar.multiselect("Kategori Seçiniz", options=df["KATEGORİ"].unique(), default=df["KATEGORİ"].unique())
+with section("kenar çubuğu filtreleri"):
+    all_cities = cube.cells["İL"].unique()
+    all_categories = cube.cells["KATEGORİ"].unique()
+    cities = st.sidebar.multiselect("İl Seçiniz", options=all_cities, default=all_cities)
+    categories = st.sidebar.multiselect("Kategori Seçiniz", options=all_categories, default=all_categories)
+
+    # Grafikler satırlar yerine seçime giren küp hücrelerinden beslenir
+    selected_cells = cube.select(cities, categories)
+# Grafik önbelleği anahtarı: seçim aynı kaldıkça grafikler yeniden çizilmez
+selection = {"İL": cities, "KATEGORİ": categories}
+
+# Grafik modu: sunucuda çizilen PNG ya da tarayıcıda çizilen vektör grafik.
+# Vektör modunda yalnızca toplanmış veri (histogram kutuları, beş sayı özeti) gönderilir.
+chart_mode = st.sidebar.radio("Grafik Modu", ["Görsel (PNG)", "Vektör (tarayıcıda çizim)"])
+client_charts = chart_mode != "Görsel (PNG)"
+
+# PNG grafikler sayfadaki yerlerine yer tutucu olarak eklenir; çizimler (paralel
+# çizim açıksa aynı anda) başlatılır ve sonuçlar sayfanın sonunda sırayla yerleştirilir.
+pending_charts = []
+
+def show_chart(chart_type, filters, chart, *args, export_path=None):
+    """charts.py'deki `chart` adlı fonksiyonla PNG ya da vega_charts'taki aynı adlı fonksiyonla vektör grafik gösterir.
 
-filtered_df = df[(df["İL"].isin(cities)) & (df["KATEGORİ"].isin(categories))]
+    charts.py (matplotlib) yalnızca önbellekte olmayan bir PNG çizilirken yüklenir.
+    """
+    if client_charts:
+        with section(f"vega: {chart_type}"):
+            st.vega_lite_chart(getattr(vega_charts, chart)(*args), use_container_width=True)
+        return
+    job = submit_render(chart_type, filters, version, chart, *args, export_path=export_path)
+    pending_charts.append((st.empty(), chart_type, job))
+
+# Tablolar sayfalara bölünür; tarayıcıya yalnızca seçilen sayfanın satırları gönderilir
+PAGE_SIZE = 50
+
+def page_slice(total, label):
+    """Sayfa seçimi; `total` satırlık tablonun seçilen sayfasının dilimini döndürür."""
+    pages = max(1, -(-total // PAGE_SIZE))
+    page = st.number_input(label, min_value=1, max_value=pages, value=1, step=1)
+    st.caption(f"{total} satır, {pages} sayfa")
+    return slice((page - 1) * PAGE_SIZE, page * PAGE_SIZE)
 #################################################################################
 st.divider()
 #################################################################################
 # Veri Önizlemesi
 st.subheader("Veri Önizlemesi")
-with st.expander('Tablo'):
-    st.dataframe(filtered_df)
+
+@profiled_fragment
+def preview_section(season, competition, version, cities, categories):
+    """Tablo önizlemesi; sayfa değişince yalnızca bu bölüm yeniden çalışır."""
+    with st.expander('Tablo'):
+        # İL/KATEGORİ seçimi taramaya iletilir; yalnızca eşleşen satır grupları okunur
+        preview_df = filtered_results(season, competition, cities, categories, version)
+        st.dataframe(preview_df.iloc[page_slice(len(preview_df), "Tablo sayfası")])
+
+preview_section(season, competition, version, cities, categories)
+#################################################################################
+st.divider()
+#################################################################################
+# Sıralama: kategori, il ve kulüp içi sıralar bölüm sürümü başına bir kez hesaplanır
+# (eşitlikte İSABET'i yüksek olan öndedir; salon_ranking.py)
+st.subheader("Sıralama")
+
+@profiled_fragment
+def ranking_section(season, competition, version, cities, categories):
+    """Sıralama tablosu; kategori, sıra türü, ad araması ve sayfa yalnızca bu bölümü yeniden çalıştırır."""
+    rankings = season_rankings(season, competition, version)
+    rank_col1, rank_col2, rank_col3 = st.columns(3)
+    with rank_col1:
+        rank_category = st.selectbox(
+            "Kategori", [category for category in rankings.categories if category in categories])
+    with rank_col2:
+        rank_method = st.radio("Sıra türü", list(RANK_METHODS), horizontal=True,
+                               help="olimpik: 1, 2, 2, 4 · yoğun: 1, 2, 2, 3")
+    with rank_col3:
+        athlete_name = st.text_input("Sporcu ara (ad)", placeholder="ör. AHMET")
+
+    # Ad araması tüm kategorilerde yapılır; aksi halde seçili kategori ve iller listelenir
+    if athlete_name.strip():
+        positions = rankings.find(athlete_name)
+    else:
+        positions = rankings.ranked(rank_category, cities)
+    rank_columns = [rank_column(scope, rank_method) for scope in RANK_SCOPES]
+    leaderboard = rankings.rows(positions[page_slice(len(positions), "Sıralama sayfası")])
+    st.dataframe(leaderboard[rank_columns + ["ADI", "İL", "KULÜB", "KATEGORİ", "HALKAPUANI", "İSABET", "TOPLAM"]],
+                 hide_index=True)
+
+ranking_section(season, competition, version, cities, categories)
 #################################################################################
 st.divider()
 #################################################################################
@@ -57,64 +149,31 @@ st.subheader("Görselleştirmeler")
 # st.markdown("**Yarışmaya Katılanlar ve Katılmayanlar**")
 
 # Katılım durumunu belirle (TOPLAM puanı 0'dan büyük olanlar katılmış sayılır)
-participants = len(filtered_df[filtered_df["TOPLAM"] > 0])
-non_participants = len(filtered_df[filtered_df["TOPLAM"] == 0])
-
-# Pie chart için veri hazırla
-participation_data = [participants, non_participants]
-labels = ['Katılanlar', 'Katılmayanlar']
+with section("toplama: katılım"):
+    participants, non_participants = cube.participation(selected_cells)
 
-# Pie chart oluştur
-fig_part, ax_part = plt.subplots(figsize=(4, 4))
-ax_part.pie(participation_data, labels=labels, autopct='%1.1f%%', colors=colors)
-ax_part.set_title("Yarışmaya Katılım Oranı", fontsize=10)
-fig_part.savefig("figures/participation_pie.png", bbox_inches="tight")
-st.pyplot(fig_part)
+# Pie chart oluştur (boş seçimde dilim olmaz, çizilemez)
+if participants + non_participants > 0:
+    show_chart("participation_pie", selection,
+               "participation_pie", participants, non_participants,
+               export_path="figures/participation_pie.png")
+else:
+    st.info("Seçime giren sporcu yok.")
 #################################################################################
 st.divider()
 #################################################################################
 # Katılımcı Sayısı: Her şehirden kaç sporcu katılmış ve katılmamış?
 st.subheader("Şehirlere Göre Katılımcı Sayısı")
-# Katılanlar ve katılmayanları hesapla
-participants_by_city = df[df["TOPLAM"] > 0]["İL"].value_counts()
-non_participants_by_city = df[df["TOPLAM"] == 0]["İL"].value_counts()
-
-# Tüm şehirleri al
-all_cities = df["İL"].unique()
-
-# Eksik değerleri 0 ile doldur
-participants_by_city = participants_by_city.reindex(all_cities, fill_value=0)
-non_participants_by_city = non_participants_by_city.reindex(all_cities, fill_value=0)
-
-# Veriyi DataFrame'e dönüştür
-participation_df = pd.DataFrame({
-    'Katılanlar': participants_by_city,
-    'Katılmayanlar': non_participants_by_city
-})
-
-# Toplam katılımcı sayısına göre sırala
-participation_df['Toplam'] = participation_df['Katılanlar'] + participation_df['Katılmayanlar']
-participation_df = participation_df.sort_values('Toplam', ascending=False)
-participation_df = participation_df.drop('Toplam', axis=1)
-
-# Stack bar chart oluştur
-fig0, ax0 = plt.subplots(figsize=(16, 8))
-participation_df.plot(kind='bar', stacked=True, ax=ax0, color=colors, width=0.8)
-
-ax0.set_ylabel("Sporcu Sayısı", fontsize=10)
-ax0.set_xlabel("İl", fontsize=10)
-ax0.set_title("Her Şehirden Katılan ve Katılmayan Sporcu Sayısı", fontsize=10)
-ax0.set_xticklabels(participation_df.index, rotation='vertical', ha="right", fontsize=10)
-
-# Toplam sayıları göster
-for c in ax0.containers:
-    ax0.bar_label(c, label_type='center')
+# Katılanlar ve katılmayanlar (tüm veri, ilk görülme sırasıyla). Kenar çubuğu
+# filtrelerine bağlı değildir: yalnızca sezon değişince hesaplanır ve grafik
+# önbelleğinde de yalnızca bölüm sürümüyle anahtarlanır.
+with section("toplama: şehir katılımı"):
+    participation_df = city_participation(season, competition, version)
 
-# Gösterge etiketini düzenle
-ax0.legend(title="Katılım Durumu")
-
-fig0.savefig("figures/city_participation.png", bbox_inches="tight")
-st.pyplot(fig0)
+# Stack bar chart oluştur (filtrelerden bağımsız, tüm veri)
+show_chart("city_participation", {},
+           "city_participation", participation_df,
+           export_path="figures/city_participation.png")
 
 #################################################################################
 # Detaylı veriyi tablo olarak göster
@@ -125,72 +184,48 @@ st.divider()
 #################################################################################
 # 1b. Şehre Göre Toplam Puan Box-and-Whisker Grafiği
 st.subheader("**Şehre Göre Ortalama Puan Dağılım Grafiği**")
-fig1b, ax1b = plt.subplots(figsize=(16, 8))
-# Sadece 0'dan büyük puanlar
-box_data = filtered_df[filtered_df["TOPLAM"] > 0]
-# Şehirleri alfabetik sırala
-box_data = box_data.sort_values("İL")
-sns.boxplot(x="İL", y="TOPLAM", data=box_data, ax=ax1b, hue='İL', palette='tab20', legend=False)
-ax1b.set_ylabel("Toplam Puan", fontsize=10)
-ax1b.set_xlabel("İl", fontsize=10)
-# Get current ticks and labels
-ticks = ax1b.get_xticks()
-labels = [label.get_text() for label in ax1b.get_xticklabels()]
-# Set ticks and labels explicitly
-ax1b.set_xticks(ticks)
-ax1b.set_xticklabels(labels, rotation='vertical', ha="right", fontsize=10)
-
-fig1b.savefig("figures/boxplot_city.png", bbox_inches="tight")
-st.pyplot(fig1b)
+# Sadece 0'dan büyük puanlar, şehirler alfabetik sırada
+with section("toplama: il kutu istatistikleri"):
+    city_hists = cube.histograms_by("İL", selected_cells)
+    city_hists = city_hists[city_hists.index.notna()].sort_index()
+    city_stats = box_stats_by(city_hists)
+show_chart("boxplot_city", selection,
+           "score_box_plot", city_stats, "İl",
+           export_path="figures/boxplot_city.png")
 #################################################################################
 st.divider()
 #################################################################################
 # 2. Kategoriye Göre Puan Dağılımı
 st.subheader("**Kategoriye Göre Puan Dağılımı**")
-fig2, ax2 = plt.subplots(figsize=(16, 8))
-box_data = filtered_df[filtered_df["TOPLAM"] > 0]
-sns.boxplot(x="KATEGORİ", y="TOPLAM", data=box_data, ax=ax2, hue='KATEGORİ', palette='tab20')
-plt.ylabel("Toplam Puan", fontsize=10)
-plt.xlabel("KATEGORİ", fontsize=10)
-ax2.tick_params(axis='both', which='major', labelsize=10)
-
-fig2.savefig("figures/boxplot_category.png", bbox_inches="tight")
-st.pyplot(fig2)
+with section("toplama: kategori kutu istatistikleri"):
+    category_hists = cube.histograms_by("KATEGORİ", selected_cells)
+    category_stats = box_stats_by(category_hists.sort_index())
+show_chart("boxplot_category", selection,
+           "score_box_plot", category_stats, "KATEGORİ", False,
+           export_path="figures/boxplot_category.png")
 #################################################################################
 st.divider()
 #################################################################################
 # Klüplere Göre Toplam Puan Box-and-Whisker (Kutu) Grafiği
 st.markdown("**Klüplere Göre Toplam Puan Puan Dağılım Grafiği**")
-# Sadece yeterli sayıda sporcusu olan klüpler gösterilsin (ör: en az 5 sporcu)
-club_counts = filtered_df[filtered_df["TOPLAM"] > 0]["KULÜB"].value_counts()
-clubs_to_show = club_counts[club_counts >= 5].index  # En az 5 sporcusu olan klüpler
-
 # Kulüp adlarını kısalt
 def shorten_club_name(name):
     # "Spor Kulübü" ifadesini "SK" ile değiştir
     name = name.replace("SPOR KULÜBÜ", "SK")
     return name
 
-club_box_data = filtered_df[
-    (filtered_df["KULÜB"].isin(clubs_to_show)) & 
-    (filtered_df["TOPLAM"] > 0)
-].copy()
-club_box_data["KULÜB"] = club_box_data["KULÜB"].apply(shorten_club_name)
-
-if not club_box_data.empty:
-    fig_club, ax_club = plt.subplots(figsize=(16, 8))
-    sns.boxplot(x="KULÜB", y="TOPLAM", data=club_box_data, ax=ax_club, hue='KULÜB', palette='tab20')
-    ax_club.set_ylabel("Toplam Puan", fontsize=10)
-    ax_club.set_xlabel("Kulüp", fontsize=10)
-    # Get current ticks and labels
-    ticks = ax_club.get_xticks()
-    labels = [label.get_text() for label in ax_club.get_xticklabels()]
-    # Set ticks and labels explicitly
-    ax_club.set_xticks(ticks)
-    ax_club.set_xticklabels(labels, rotation='vertical', ha="right", fontsize=10)
-
-    fig_club.savefig("figures/boxplot_club.png", bbox_inches="tight")
-    st.pyplot(fig_club)
+# Sadece yeterli sayıda sporcusu olan klüpler gösterilsin (ör: en az 5 sporcu)
+with section("toplama: kulüp kutu istatistikleri"):
+    club_hists = cube.histograms_by("KULÜB", selected_cells)
+    club_hists = club_hists[club_hists.sum(axis=1) >= 5]  # En az 5 sporcusu olan klüpler
+    club_hists.index = club_hists.index.astype(str).map(shorten_club_name)
+    club_hists = club_hists.groupby(level=0, sort=False).sum()
+    club_stats = box_stats_by(club_hists)
+
+if not club_hists.empty:
+    show_chart("boxplot_club", selection,
+               "score_box_plot", club_stats, "Kulüp",
+               export_path="figures/boxplot_club.png")
     st.markdown("Yalnızca en az 5 sporcusu olan kulüpler gösterilmiştir.")
     st.markdown("*Not: Kulüp adları kısaltılmış olarak gösterilmektedir.*")
 else:
@@ -200,31 +235,11 @@ st.divider()
 #################################################################################
 # 4. Her Kategori için Toplam Puan Histogramı (0 puan hariç)
 st.subheader("**Her Kategori için Toplam Puan Histogramı (Katılmayanlar Hariç)**")
-for kategori in filtered_df["KATEGORİ"].unique():
+for kategori, counts in category_hists.iterrows():
     st.markdown(f"### **{kategori}** kategorisi için toplam puan dağılımı:")
-    fig, ax = plt.subplots(figsize=(16, 8))
-    # Sadece 0'dan büyük puanlar
-    data = filtered_df[(filtered_df["KATEGORİ"] == kategori) & (filtered_df["TOPLAM"] > 0)]["TOPLAM"].dropna()
-    n, bins, patches = ax.hist(data, bins=21, color='skyblue', edgecolor='white')
-    
-    total = len(data)
-    for count, patch in zip(n, patches):
-        percentage = f'{(count/total)*100:.1f}%'
-        plt.text(patch.get_x() + patch.get_width()/2, count, 
-                s=int(count), #[int(count), percentage], 
-                mouseover=True,
-                ha='center', va='bottom', rotation='vertical',
-                fontsize='medium',
-                )
-    
-    plt.xticks(np.arange(0, 110, step=5), rotation='vertical', fontsize=10)
-    plt.yticks(np.arange(0, 10, step=10), fontsize=10)
-    ax.set_title(f"{kategori} Kategorisi Puan Dağılımı", fontsize=10)
-    ax.set_xlabel("Toplam Puan", fontsize=10)
-    ax.set_ylabel("Sporcu Sayısı", fontsize=10)
-
-    fig.savefig(f"figures/histogram_{kategori}.png", bbox_inches="tight")
-    st.pyplot(fig)
+    show_chart(f"histogram_{kategori}", selection,
+               "category_histogram", kategori, counts.to_numpy(),
+               export_path=f"figures/histogram_{kategori}.png")
     st.markdown(f"{kategori} kategorisinde (0 puan hariç) sporcuların toplam puanlarının dağılımı yukarıda gösterilmiştir.")
 #################################################################################
 st.divider()
@@ -239,3 +254,11 @@ st.markdown("""
 
 Veriyi keşfetmek için kenar çubuğundaki filtreleri kullanabilirsiniz!
 """)
+
+# Bekleyen grafikleri sayfa sırasıyla yerleştir
+for slot, chart_type, job in pending_charts:
+    png = job.result()
+    with section(f"st.image: {chart_type}"):
+        slot.image(png, use_container_width=True)
+
+show_profile_panel()
@@ -1,48 +1,59 @@
-import pandas as pd
 import numpy as np
-import seaborn as sns
-import matplotlib.pyplot as plt
 import streamlit as st
-import re
-import unicodedata
-import base64
-import os
+from datetime import date
 
-df_tahlil = pd.read_excel("dataset/melike-tahlil-merged_final.xlsx", index_col=False, sheet_name='Sheet1')
-tests = df_tahlil.Tahlil.unique()
-df_tahlil['Tarih'] = pd.to_datetime(df_tahlil['Tarih'], format='%d.%m.%Y %H:%M:%S')
-df_tahlil['Tarih2'] = df_tahlil['Tarih'].dt.strftime('%Y-%m-%d')
-df_tarih_sirali = df_tahlil.sort_values(by='Tarih2', ascending=True)
+import vega_charts
+from document_catalog import THUMBNAIL_SIZE, get_document_catalog
+from document_server import show_document
+from lab_anomaly import RECENT_DRAWS, ZSCORE_CAP, ZSCORE_THRESHOLD, ZSCORE_WINDOW, anomaly_report
+from lab_data import (REFERENCE_UNPARSED, dataset_version, downsample_indices, load_lab_results,
+                      test_index)
+from profiler import profiled_fragment, section, show_profile_panel, start_run
 
-def clean_text(text):
-    if isinstance(text, str):
-        text = re.sub(r'[\x00-\x1F\x7F-\x9F\u200B-\u200D\uFEFF\u202C]+', '', text)
-        text = unicodedata.normalize('NFKC', text)
-    return text
+# Bölüm süre ölçümü (?profile=1 ile açılır, sonuçlar kenar çubuğunda)
+start_run()
 
-df_tahlil['Tahlil'] = df_tahlil['Tahlil'].apply(clean_text)
+# Normalize edilmiş, tarihe göre sıralı kopya (.cache/ altında; yeni satırlar artımlı eklenir)
+with section("Excel yükleme"):
+    df_tarih_sirali = load_lab_results()
+# Tahlil başına hazır zaman serileri; seçim değişince yalnızca dizi dilimleri alınır
+lab_version = dataset_version()
+with section("tahlil indeksi"):
+    index = test_index(df_tarih_sirali, lab_version)
 
 st.title("Tahlil Verileri Grafik Sunumu")
 st.subheader("Zamana Bağlı Değişim")
 
-selected_test = st.selectbox("Bir tahlil seçin:", tests)
+# Vektör modunda yalnızca zaman serisi noktaları gönderilir, grafiği tarayıcı çizer.
+# Grafik modu her iki grafik bölümünü etkilediğinden bölümlerin dışında, sayfa düzeyindedir.
+chart_mode = st.radio("Grafik Modu", ["Görsel (PNG)", "Vektör (tarayıcıda çizim)"], horizontal=True)
+client_charts = chart_mode != "Görsel (PNG)"
 
-def draw_graph(tahlil):
-    df = df_tarih_sirali.query("Tahlil == @tahlil")
-    try:
-        tahlil_adı = df.Tahlil.values[0]
-        birim = df['Sonuç Birimi'].values[0]
-        referans = df['Referans Değeri'].values[0]
-        referans_parcalar = referans.split()
-        if len(referans_parcalar) >= 3:
-            referans_alt = float(referans_parcalar[0].replace(",", "."))
-            referans_ust = float(referans_parcalar[2].replace(",", "."))
-        else:
-            referans_alt = referans_ust = None
+# Sayfa bölümleri st.fragment'tir: bir bölümdeki etkileşim yalnızca o bölümü yeniden
+# çalıştırır. Bölümün bağımlı olduğu girdiler argüman olarak verilir; bunlar (veri,
+# grafik modu) değiştiğinde sayfa tamamen yeniden çalışır ve bölümler yeni girdilerle çizilir.
+def draw_graph(tahlil, index, client_charts):
+    series = index.get(tahlil)
+    birim = series.unit
+    referans = series.reference
+    referans_alt = series.reference_low
+    referans_ust = series.reference_high
+    if series.reference_status == REFERENCE_UNPARSED:
+        st.warning(f"Referans değeri sayısal bir aralık değil, çizgiler gösterilmiyor: {referans}")
 
-        x = df.Tarih.values
-        y = df.Sonuç.values
+    x = series.dates
+    y = series.values
 
+    if client_charts:
+        with section("draw_graph: vega"):
+            st.vega_lite_chart(vega_charts.time_series(tahlil, x, y, f"{birim} ({referans})",
+                                                       referans_alt, referans_ust),
+                               use_container_width=True)
+        return
+
+    # matplotlib yalnızca PNG modunda ve ilk çizimde yüklenir
+    import matplotlib.pyplot as plt
+    with section("draw_graph: plt çizim"):
         fig, ax = plt.subplots(figsize=(14, 6))
         ax.plot(x, y, marker='o', label='Sonuç')
         if referans_alt is not None and referans_ust is not None:
@@ -54,12 +65,100 @@ def draw_graph(tahlil):
         ax.set_xticks(x)
         ax.tick_params(axis='x', rotation=90, width=2)
         ax.legend()
+    # savefig (PNG kodlama) ve medya deposuna yazma
+    with section("draw_graph: st.pyplot"):
         st.pyplot(fig)
-    except Exception as e:
-        st.error(f"Grafik çizilemedi: {e}")
 
-if selected_test:
-    draw_graph(selected_test)
+@profiled_fragment
+def test_section(index, client_charts):
+    """Tek tahlil grafiği; tahlil seçimi yalnızca bu bölümü yeniden çalıştırır."""
+    selected_test = st.selectbox("Bir tahlil seçin:", index.names)
+    if selected_test:
+        draw_graph(selected_test, index, client_charts)
+
+test_section(index, client_charts)
+
+# Birden fazla tahlilin ortak zaman ekseninde karşılaştırılması (tek figür, tek çizim)
+st.subheader("Tahlil Karşılaştırma")
+comparison_defaults = ['WBC (KAN)', 'NEUT# (KAN)', 'PLT (KAN)',
+                       'KARSINOEMBRIYONIK ANTIJEN (CEA) (SERUM/PLAZMA)', 'CA 19-9 (SERUM/PLAZMA)']
+# Küçük çoklu grafiklerin genişliği (inç), çözünürlüğü ve yatay kenar boşlukları;
+# bir panelde piksel sayısından fazla nokta çizilmez
+SMALL_MULTIPLES_WIDTH = 14
+SMALL_MULTIPLES_DPI = 100
+SMALL_MULTIPLES_MARGINS = (.08, .98)
+
+def draw_small_multiples(tahliller, index, client_charts):
+    left, right = SMALL_MULTIPLES_MARGINS
+    max_points = int(SMALL_MULTIPLES_WIDTH * SMALL_MULTIPLES_DPI * (right - left))
+    panels = []
+    for tahlil in tahliller:
+        series = index.get(tahlil)
+        keep = downsample_indices(series, max_points)
+        panels.append((tahlil, series.unit, series.dates[keep], series.values[keep],
+                       series.lows[keep], series.highs[keep]))
+
+    if client_charts:
+        st.vega_lite_chart(vega_charts.small_multiples(panels))
+        return
+
+    import matplotlib.pyplot as plt
+    fig, axes = plt.subplots(len(tahliller), 1, figsize=(SMALL_MULTIPLES_WIDTH, 2.2 * len(tahliller)),
+                             sharex=True, squeeze=False, dpi=SMALL_MULTIPLES_DPI)
+    for ax, (tahlil, birim, x, y, alt, ust) in zip(axes[:, 0], panels):
+        banded = ~np.isnan(alt) & ~np.isnan(ust)
+        if banded.any():
+            ax.fill_between(x, alt, ust, where=banded, step='post', color='r', alpha=.1,
+                            linewidth=0, label='Referans Aralığı')
+        ax.plot(x, y, marker='o', markersize=3, linewidth=1, label='Sonuç')
+        disinda = banded & ((y < alt) | (y > ust))
+        ax.plot(x[disinda], y[disinda], 'o', color='r', markersize=4, label='Referans Dışı')
+        ax.set_title(tahlil, fontsize=10, loc='left')
+        ax.set_ylabel(birim or '')
+    axes[0, 0].legend(loc='upper right', fontsize=8)
+    axes[-1, 0].tick_params(axis='x', rotation=90)
+    # Sabit kenar boşlukları: tight_layout ve bbox_inches="tight" her panelin
+    # metinlerini ayrıca ölçer, çok panelde çizimden daha uzun sürer
+    height = fig.get_figheight()
+    fig.subplots_adjust(left=left, right=right, top=1 - .35 / height, bottom=.9 / height, hspace=.45)
+    with section("karşılaştırma: st.pyplot"):
+        st.pyplot(fig, dpi=SMALL_MULTIPLES_DPI, bbox_inches=None)
+    plt.close(fig)
+
+@profiled_fragment
+def comparison_section(index, client_charts):
+    """Tahlil karşılaştırması; tahlil listesi değişince yalnızca bu bölüm yeniden çizilir."""
+    selected_tests = st.multiselect("Karşılaştırılacak tahliller:", index.names,
+                                    default=[test for test in comparison_defaults if test in index])
+    if selected_tests:
+        with section("karşılaştırma"):
+            draw_small_multiples(selected_tests, index, client_charts)
+
+comparison_section(index, client_charts)
+
+# Tüm tahlillerin tek geçişte taranması: referans dışı sonuçlar, ani sapmalar ve eğilim
+st.subheader("Anormallik ve Eğilim Özeti")
+
+@profiled_fragment
+def anomaly_section(index, version):
+    """Tahlilleri son sonuçlarının ne kadar anormal olduğuna göre sıralar."""
+    recent = st.slider("Son ölçüm sayısı", min_value=3, max_value=20, value=RECENT_DRAWS)
+    with section("anormallik taraması"):
+        report = anomaly_report(index, version, recent=recent)
+    st.caption(f"Ani sapma: sonucun aynı tahlilin önceki {ZSCORE_WINDOW} ölçümüne göre "
+               f"|z| ≥ {ZSCORE_THRESHOLD:g} olması. Skor: son ölçümlerdeki referans dışı oranı "
+               f"+ en büyük |z| (en çok {ZSCORE_CAP:g}) / {ZSCORE_THRESHOLD:g}.")
+    decimal = st.column_config.NumberColumn(format="%.2f")
+    st.dataframe(report.summary, hide_index=True, use_container_width=True, column_config={
+        "Skor": decimal,
+        "Son Tarih": st.column_config.DatetimeColumn(format="DD.MM.YYYY HH:mm"),
+        f"Son {recent} Ölçümde Referans Dışı (%)": st.column_config.NumberColumn(format="%.0f"),
+        f"Son {recent} Ölçümde En Büyük |z|": decimal,
+        "Son Değişim (%)": st.column_config.NumberColumn(format="%.1f"),
+        "Eğim (gün başına)": st.column_config.NumberColumn(format="%.3f"),
+    })
+
+anomaly_section(index, lab_version)
 
 st.markdown("""
             ### Notlar: Hastanın genel seyri
@@ -80,38 +179,57 @@ st.markdown("""
 st.header("Belge Görüntüleyici (PDF / Görsel)")
 st.markdown(""" Dosya görüntülenemiyorsa aşağıdaki button ile indirebilirsiniz. """)
 
-allowed_extensions = ('.pdf', '.jpg', '.jpeg', '.png')
-document_files = [f for f in os.listdir("documents") if f.lower().endswith(allowed_extensions)]
-
-if document_files:
-    selected_file = st.selectbox("Bir dosya seçin:", document_files)
-    file_path = os.path.join("documents", selected_file)
-
-    if selected_file.lower().endswith(".pdf"):
-        with open(file_path, "rb") as f:
-            base64_pdf = base64.b64encode(f.read()).decode('utf-8')
-            pdf_display = f'<iframe src="data:application/pdf;base64,{base64_pdf}" width="700" height="900" type="application/pdf"></iframe>'
-            st.markdown(pdf_display, unsafe_allow_html=True)
-            # İndirme düğmesi
-            st.download_button(
-                label="PDF dosyasını indir",
-                data=f,
-                file_name=selected_file,
-                mime="application/pdf"
-            )
+@profiled_fragment
+def documents_section(catalog):
+    """Belge görüntüleyici; tarih, bölüm ve belge seçimi yalnızca bu bölümü yeniden çalıştırır."""
+    # Katalog her bölüm çalıştırmasında klasörle eşitlenir (yalnızca değişen dosyalar işlenir)
+    with section("belge kataloğu eşitleme"):
+        catalog.sync()
+    first_date, last_date = catalog.date_range()
+    all_departments = catalog.departments()
+    documents = []
+
+    if all_departments:
+        doc_col1, doc_col2 = st.columns(2)
+        start = end = None
+        include_undated = True
+        if first_date is not None:
+            with doc_col1:
+                date_range = st.date_input(
+                    "Tarih aralığı:",
+                    value=(date.fromisoformat(first_date), date.fromisoformat(last_date)),
+                    min_value=date.fromisoformat(first_date),
+                    max_value=date.fromisoformat(last_date),
+                )
+            # Aralığın yalnızca başlangıcı seçiliyken bitiş ucu açık bırakılır
+            start = date_range[0].isoformat() if len(date_range) > 0 else None
+            end = date_range[1].isoformat() if len(date_range) > 1 else None
+            # Adında tarih olmayan belgeler tüm aralık seçiliyken listelenir
+            include_undated = (start, end) == (first_date, last_date)
+        with doc_col2:
+            selected_departments = st.multiselect("Bölüm:", all_departments, default=all_departments)
+        documents = catalog.query(start, end, selected_departments, include_undated, with_thumbnails=True)
+
+    if documents:
+        labels = {doc["name"]: f"{doc['date'] or 'tarihsiz'} · {doc['department']} · {doc['name']}"
+                  for doc in documents}
+        # Listedeki görsellerin katalogdaki küçük önizlemeleri (dosyalar yeniden açılmaz)
+        thumbnails = [doc for doc in documents if doc["thumbnail"]]
+        if thumbnails:
+            with st.expander(f"Görsel önizlemeleri ({len(thumbnails)})"):
+                st.image([doc["thumbnail"] for doc in thumbnails],
+                         caption=[f"{doc['date'] or 'tarihsiz'} · {doc['department']}" for doc in thumbnails],
+                         width=THUMBNAIL_SIZE[0])
+        selected_file = st.selectbox("Bir dosya seçin:", list(labels), format_func=labels.get)
+        # PDF'ler statik sunumdan akış halinde, görseller küçültülmüş önizleme olarak gösterilir
+        with section("belge gösterimi"):
+            show_document(selected_file)
+    elif all_departments:
+        st.info("Seçilen tarih aralığında ve bölümlerde belge bulunamadı.")
     else:
-        st.image(file_path, caption=selected_file, use_container_width=True)
-        # İndirme düğmesi
-        with open(file_path, "rb") as f:
-            st.download_button(
-                label="Görsel dosyasını indir",
-                data=f,
-                file_name=selected_file,
-                mime="image/jpeg" if selected_file.lower().endswith(('.jpg', '.jpeg')) else "image/png"
-            )
-else:
-    st.info("Documents klasöründe PDF veya görsel dosyası bulunamadı.")
+        st.info("Documents klasöründe PDF veya görsel dosyası bulunamadı.")
 
+documents_section(get_document_catalog())
 
 with st.sidebar:
     
@@ -202,3 +320,5 @@ with st.sidebar:
     * Lupus Antikoagülan/Anti-kardiyolipin: Otoimmün pıhtılaşma bozuklukları.
     
     """)
+
+show_profile_panel()
@@ -0,0 +1,77 @@
+"""Sunucu açılmadan önce önbellekleri hazırlar; ilk ziyaretçi soğuk başlangıcı beklemez.
+
+    python prewarm.py && streamlit run main.py
+
+Hazırlananlar:
+
+* matplotlib yazı tipi önbelleği ve charts.py stili (taze bir kapsayıcıda ilk
+  çizimde birkaç saniye sürer)
+* logonun yerel kopyası (assets.py; ağ erişimi yoksa atlanır, sayfa yer tutucuyu gösterir)
+* sayfaların disk önbellekleri: Parquet kopyaları, belge kataloğu ve varsayılan
+  seçimle çizilen grafikler (.cache/ altında). Sayfalar varsayılan widget
+  değerleriyle bir kez, sunucu olmadan çalıştırılır.
+
+Streamlit'in bellek içi önbellekleri (st.cache_data) sunucu sürecine aittir;
+onlar ilk ziyarette disk önbelleklerinden hızlıca doldurulur.
+"""
+import argparse
+import functools
+import os
+import sys
+import time
+
+from assets import LOGO_PATH, LOGO_URL, fetch_asset
+
+PAGES = ["main.py", "melike.py"]
+PAGE_TIMEOUT = 600
+
+
+def warm_matplotlib():
+    """Yazı tipi önbelleğini kurar ve charts.py stiliyle Türkçe metinli bir figür çizer."""
+    import charts
+
+    fig = charts.participation_pie(1, 1)
+    fig.text(.5, .5, "Sonuç Analizi ğüşıöç İĞÜŞÖÇ")
+    charts.figure_to_png(fig)
+
+
+def warm_logo():
+    """Logonun yerel kopyası; indirilemezse uyarı metni döndürür."""
+    if not fetch_asset(LOGO_URL, LOGO_PATH):
+        return f"indirilemedi; yer tutucu logo gösterilecek ({LOGO_PATH} elle eklenebilir)"
+
+
+def warm_page(path):
+    """Sayfayı sunucu olmadan (AppTest) bir kez çalıştırır; hata varsa mesajını döndürür."""
+    from streamlit.testing.v1 import AppTest
+
+    at = AppTest.from_file(path, default_timeout=PAGE_TIMEOUT).run()
+    if at.exception:
+        return "; ".join(str(e.value) for e in at.exception)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Sunucu açılışı öncesi önbellekleri hazırlar")
+    parser.add_argument("pages", nargs="*", default=PAGES, help="Çalıştırılacak sayfalar")
+    parser.add_argument("--no-pages", action="store_true",
+                        help="Yalnızca matplotlib ve logo; sayfaları çalıştırma")
+    args = parser.parse_args(argv)
+    # Sayfalar bu klasördeki modülleri yükler
+    sys.path.insert(0, os.getcwd())
+
+    # (ad, adım, başarısızsa çıkış kodu 1 mi)
+    steps = [("matplotlib", warm_matplotlib, True), ("logo", warm_logo, False)]
+    if not args.no_pages:
+        steps += [(page, functools.partial(warm_page, page), True) for page in args.pages]
+
+    failed = False
+    for name, step, required in steps:
+        start = time.perf_counter()
+        problem = step()
+        print(f"{name:<12} {time.perf_counter() - start:6.2f} sn  {f'UYARI: {problem}' if problem else 'hazır'}")
+        failed |= required and problem is not None
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
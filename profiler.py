@@ -0,0 +1,117 @@
+import csv
+import functools
+import io
+import json
+import os
+import time
+from collections import deque
+from contextlib import contextmanager
+from datetime import datetime
+
+import streamlit as st
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+# Bölüm süre ölçümü isteğe bağlıdır: adres satırında ?profile=1 ya da APP_PROFILE=1
+# ortam değişkeni. Kapalıyken `section` yalnızca bir sözlük araması yapar.
+PROFILE_ENV = os.environ.get("APP_PROFILE", "0") == "1"
+PROFILE_PARAM = "profile"
+
+RUN_KEY = "_profiler_run"
+HISTORY_KEY = "_profiler_history"
+# Oturum başına saklanan en fazla çalıştırma (rerun) sayısı
+HISTORY_SIZE = 20
+
+
+def profiling_enabled():
+    return PROFILE_ENV or st.query_params.get(PROFILE_PARAM) == "1"
+
+
+def start_run(scope="sayfa"):
+    """Yeni bir çalıştırmanın ölçümünü başlatır; betiğin en başında çağrılır.
+
+    `scope` çalıştırmanın kapsamıdır: tüm sayfa ya da yalnızca bir bölüm (fragment).
+    """
+    if not profiling_enabled():
+        st.session_state[RUN_KEY] = None
+        return
+    run = {"started": datetime.now().isoformat(timespec="seconds"), "scope": scope,
+           "t0": time.perf_counter(), "sections": []}
+    st.session_state[RUN_KEY] = run
+    st.session_state.setdefault(HISTORY_KEY, deque(maxlen=HISTORY_SIZE)).append(run)
+
+
+def _current_run():
+    # Betik dışında (ör. çizim süreçleri) ve ölçüm kapalıyken None
+    if get_script_run_ctx(suppress_warning=True) is None:
+        return None
+    return st.session_state.get(RUN_KEY)
+
+
+@contextmanager
+def section(name):
+    """Bloğun süresini geçerli çalıştırmaya `name` adıyla kaydeder."""
+    run = _current_run()
+    if run is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        end = time.perf_counter()
+        run["sections"].append({
+            "section": name,
+            "start_ms": round((start - run["t0"]) * 1000, 3),
+            "duration_ms": round((end - start) * 1000, 3),
+        })
+
+
+def profiled_fragment(func):
+    """`st.fragment` ile aynı; bölümün süresini de kaydeder.
+
+    Yalnızca bölümün yeniden çalıştığı rerun'lar (bölüm içindeki bir widget
+    değişince) ayrı bir çalıştırma olarak, bölüm adıyla kaydedilir.
+    """
+    @functools.wraps(func)
+    def run_section(*args, **kwargs):
+        ctx = get_script_run_ctx(suppress_warning=True)
+        if ctx is not None and ctx.fragment_ids_this_run:
+            start_run(func.__name__)
+        with section(func.__name__):
+            return func(*args, **kwargs)
+    return st.fragment(run_section)
+
+
+def run_records(runs):
+    """Çalıştırmaların bölüm kayıtları, çalıştırma numarasıyla düz liste olarak."""
+    return [{"run": i, "started": run["started"], "scope": run["scope"], **record}
+            for i, run in enumerate(runs, start=1) for record in run["sections"]]
+
+
+def records_csv(records):
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=["run", "started", "scope", "section", "start_ms", "duration_ms"])
+    writer.writeheader()
+    writer.writerows(records)
+    return buffer.getvalue()
+
+
+def show_profile_panel():
+    """Kenar çubuğunda bölüm süreleri ve dışa aktarma; betiğin en sonunda çağrılır.
+
+    Süreler sunucu tarafıdır: tarayıcıya gönderim (websocket) ve istemcide çizim
+    dahil değildir; `st.image`/`st.pyplot` bölümleri PNG'nin kodlanıp medya
+    deposuna yazılmasını kapsar.
+    """
+    run = _current_run()
+    if run is None:
+        return
+    total_ms = (time.perf_counter() - run["t0"]) * 1000
+    history = list(st.session_state.get(HISTORY_KEY, []))
+    with st.sidebar.expander("Profil (bölüm süreleri)"):
+        st.caption(f"Bu çalıştırma ({run['scope']}): {total_ms:.0f} ms, {len(run['sections'])} bölüm")
+        st.dataframe(run["sections"], hide_index=True, use_container_width=True)
+        st.download_button("JSON olarak indir", json.dumps(run_records(history), ensure_ascii=False, indent=2),
+                           file_name="profil.json", mime="application/json")
+        st.download_button("CSV olarak indir", records_csv(run_records(history)),
+                           file_name="profil.csv", mime="text/csv")
@@ -0,0 +1,336 @@
+import functools
+import hashlib
+import json
+import os
+import pickle
+import queue
+import subprocess
+import sys
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from datastore import CACHE_DIR
+from profiler import section
+
+RENDER_CACHE_DIR = os.path.join(CACHE_DIR, "figures")
+# Bellek ve disk katmanlarının üst sınırları (bayt)
+MEMORY_LIMIT = 64 * 1024 * 1024
+DISK_LIMIT = 256 * 1024 * 1024
+
+# Paralel çizim: RENDER_PROCESSES > 0 ise önbellekte olmayan grafikler ayrı süreçlerde
+# (render_worker.py) çizilir (matplotlib iş parçacığı güvenli değildir). Her işçi belirli
+# sayıda grafikten sonra yenilenir; bir figürdeki bellek sızıntısı sunucuya taşınmaz.
+RENDER_PROCESSES = int(os.environ.get("RENDER_PROCESSES", "0"))
+RENDER_TASKS_PER_CHILD = int(os.environ.get("RENDER_TASKS_PER_CHILD", "20"))
+
+
+def _chart(name):
+    # charts (matplotlib, seaborn) yalnızca önbellekte olmayan bir grafik çizilirken
+    # yüklenir; grafikleri önbellekten gelen ya da vektör moddaki sayfa bunları hiç yüklemez
+    import charts
+    return getattr(charts, name)
+
+
+def normalize_filters(filters):
+    """Filtre seçimini sıradan bağımsız, JSON'a yazılabilir biçime getirir."""
+    return {name: sorted(str(value) for value in values) for name, values in sorted(filters.items())}
+
+
+@functools.lru_cache(maxsize=None)
+def charts_version():
+    """charts.py içeriğinin özeti; çizim kodu değişince disk önbelleğindeki PNG'ler kullanılmaz.
+
+    Dosya okunur, modül yüklenmez (charts yalnızca çizimde yüklenir).
+    """
+    with open(os.path.join(os.path.dirname(os.path.abspath(__file__)), "charts.py"), "rb") as f:
+        return hashlib.sha1(f.read()).hexdigest()[:16]
+
+
+def _update_digest(digest, value):
+    # Çizim argümanları küçüktür (sayımlar, kutu istatistikleri, histogramlar);
+    # tür ve şekil de özete girer, böylece [1, 2] ile (1, 2) ya da 1 ile 1.0 karışmaz
+    digest.update(type(value).__name__.encode("utf-8"))
+    if isinstance(value, pd.DataFrame):
+        _update_digest(digest, list(value.columns))
+        _update_digest(digest, list(value.index))
+        digest.update(pd.util.hash_pandas_object(value, index=False).to_numpy().tobytes())
+    elif isinstance(value, pd.Series):
+        _update_digest(digest, value.name)
+        _update_digest(digest, value.to_frame())
+    elif isinstance(value, np.ndarray):
+        digest.update(f"{value.dtype.str}{value.shape}".encode("utf-8"))
+        digest.update(np.ascontiguousarray(value).tobytes())
+    elif isinstance(value, dict):
+        for name, item in sorted(value.items(), key=lambda pair: str(pair[0])):
+            _update_digest(digest, name)
+            _update_digest(digest, item)
+    elif isinstance(value, (list, tuple)):
+        digest.update(str(len(value)).encode("utf-8"))
+        for item in value:
+            _update_digest(digest, item)
+    else:
+        digest.update(repr(value).encode("utf-8"))
+    digest.update(b";")
+
+
+def args_digest(args):
+    """Çizim argümanlarının özeti; grafiğe giren veri (sayfada nasıl hesaplandığından bağımsız) anahtara katılır."""
+    digest = hashlib.sha1()
+    _update_digest(digest, list(args))
+    return digest.hexdigest()
+
+
+def render_key(chart_type, filters, version, args=()):
+    """Grafik türü, normalize edilmiş filtre seçimi, veri sürümü, çizim kodu sürümü ve argümanlardan önbellek anahtarı.
+
+    Argümanların özeti de anahtardadır: kutu istatistikleri ya da kulüp eşiği gibi
+    charts.py dışında hesaplanan girdiler değişince eski PNG diskten gelmez.
+    """
+    payload = json.dumps([chart_type, normalize_filters(filters), version, charts_version(),
+                          args_digest(args)], ensure_ascii=False)
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+
+class RenderCache:
+    """PNG baytları için iki katmanlı (bellek + disk) LRU önbellek.
+
+    Her iki katman da toplam bayt sınırına göre en eski erişilen girdiyi atar.
+    Disk katmanında erişim zamanı dosyanın mtime değeriyle tutulur.
+    """
+
+    def __init__(self, directory=RENDER_CACHE_DIR, memory_limit=MEMORY_LIMIT, disk_limit=DISK_LIMIT):
+        self.directory = directory
+        self.memory_limit = memory_limit
+        self.disk_limit = disk_limit
+        self._memory = OrderedDict()
+        self._memory_size = 0
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+        self._disk = OrderedDict()
+        entries = sorted(os.scandir(directory), key=lambda entry: entry.stat().st_mtime_ns)
+        for entry in entries:
+            if entry.name.endswith(".png"):
+                self._disk[entry.name[:-4]] = entry.stat().st_size
+        self._disk_size = sum(self._disk.values())
+
+    def _path(self, key):
+        return os.path.join(self.directory, key + ".png")
+
+    def _remember(self, key, png):
+        # Bellek katmanına ekle ve sınırı aşan en eski girdileri at
+        if key in self._memory:
+            self._memory_size -= len(self._memory.pop(key))
+        self._memory[key] = png
+        self._memory_size += len(png)
+        while self._memory_size > self.memory_limit and len(self._memory) > 1:
+            _, old = self._memory.popitem(last=False)
+            self._memory_size -= len(old)
+
+    def get(self, key):
+        with self._lock:
+            png = self._memory.get(key)
+            if png is not None:
+                self._memory.move_to_end(key)
+                return png
+            if key not in self._disk:
+                return None
+            self._disk.move_to_end(key)
+        try:
+            with open(self._path(key), "rb") as f:
+                png = f.read()
+            os.utime(self._path(key))
+        except FileNotFoundError:
+            with self._lock:
+                self._disk_size -= self._disk.pop(key, 0)
+            return None
+        with self._lock:
+            self._remember(key, png)
+        return png
+
+    def put(self, key, png):
+        path = self._path(key)
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(png)
+        os.replace(tmp_path, path)
+        with self._lock:
+            self._remember(key, png)
+            self._disk_size += len(png) - self._disk.pop(key, 0)
+            self._disk[key] = len(png)
+            evicted = []
+            while self._disk_size > self.disk_limit and len(self._disk) > 1:
+                old_key, size = self._disk.popitem(last=False)
+                self._disk_size -= size
+                evicted.append(old_key)
+        for old_key in evicted:
+            try:
+                os.remove(self._path(old_key))
+            except FileNotFoundError:
+                pass
+
+
+@st.cache_resource(show_spinner=False)
+def get_render_cache():
+    """Süreç genelinde paylaşılan grafik önbelleği."""
+    return RenderCache()
+
+
+WORKER_SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "render_worker.py")
+
+
+class _Worker:
+    """render_worker.py betiğini çalıştıran tek bir çizim süreci."""
+
+    def __init__(self):
+        # Bağımsız betik olarak başlatılır: sayfa betiği (Streamlit'in __main__
+        # modülü) işçide yürütülmez ve sys.modules'e dokunulmaz
+        self.process = subprocess.Popen([sys.executable, WORKER_SCRIPT],
+                                        stdin=subprocess.PIPE, stdout=subprocess.PIPE)
+        self.tasks = 0
+
+    def call(self, chart, args):
+        self.tasks += 1
+        pickle.dump((chart, args), self.process.stdin)
+        self.process.stdin.flush()
+        status, value = pickle.load(self.process.stdout)
+        if status == "error":
+            raise value
+        return value
+
+    def close(self):
+        # stdin kapanınca işçi süren çizimi bitirip çıkar
+        try:
+            self.process.stdin.close()
+        except OSError:
+            pass
+
+    def kill(self):
+        self.process.kill()
+        self.process.wait()
+
+
+class RenderPool:
+    """Grafik çizim süreç havuzu.
+
+    Tüm işçi süreçler havuz kurulurken başlatılır. Çizimler havuzun iş
+    parçacıklarından boştaki bir işçiye gönderilir; `tasks_per_process` grafik
+    çizen işçi kapatılıp yerine yenisi başlatılır. Çöken işçi de yenilenir ve
+    o grafik için BrokenProcessPool verilir.
+    """
+
+    def __init__(self, processes, tasks_per_process):
+        self.processes = processes
+        self.tasks_per_process = tasks_per_process
+        self._idle = queue.SimpleQueue()
+        for _ in range(processes):
+            self._idle.put(_Worker())
+        self._threads = ThreadPoolExecutor(max_workers=processes, thread_name_prefix="render")
+
+    def _call(self, chart, args):
+        worker = self._idle.get()
+        try:
+            return worker.call(chart, args)
+        except (EOFError, OSError, pickle.UnpicklingError) as exc:
+            worker.kill()
+            worker = None
+            raise BrokenProcessPool("çizim süreci beklenmedik şekilde kapandı") from exc
+        finally:
+            if worker is None or worker.tasks >= self.tasks_per_process:
+                if worker is not None:
+                    worker.close()
+                worker = _Worker()
+            self._idle.put(worker)
+
+    def submit(self, chart, *args):
+        """charts.py'deki `chart` adlı fonksiyonla çizimi başlatır; PNG baytları için Future döndürür."""
+        return self._threads.submit(self._call, chart, args)
+
+
+@st.cache_resource(show_spinner=False)
+def get_render_pool():
+    """Grafik çizim süreç havuzu; paralel çizim kapalıysa None."""
+    if RENDER_PROCESSES <= 0:
+        return None
+    return RenderPool(RENDER_PROCESSES, RENDER_TASKS_PER_CHILD)
+
+
+def _export(png, export_path):
+    # Dışa aktarılan figür dosyası yalnızca yeniden çizimde ve atomik olarak yazılır
+    os.makedirs(os.path.dirname(export_path) or ".", exist_ok=True)
+    tmp_path = f"{export_path}.{threading.get_ident()}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(png)
+    os.replace(tmp_path, export_path)
+
+
+class RenderJob:
+    """Önbellekten gelen ya da süreç havuzunda çizilmekte olan bir grafik."""
+
+    def __init__(self, key, chart, args, export_path=None, png=None, future=None):
+        self.key = key
+        self.chart = chart
+        self.args = args
+        self.export_path = export_path
+        self._png = png
+        self._future = future
+
+    def _render(self):
+        # Yerinde çizim: figür oluşturma ve PNG kodlama ayrı bölümler olarak ölçülür
+        name = self.chart
+        with section(f"çizim: {name}"):
+            fig = _chart(name)(*self.args)
+        with section(f"savefig: {name}"):
+            return _chart("figure_to_png")(fig)
+
+    def result(self):
+        """PNG baytlarını döndürür; gerekirse çizimin bitmesini bekler."""
+        if self._png is None:
+            if self._future is not None:
+                try:
+                    with section(f"süreç havuzu: {self.chart}"):
+                        self._png = self._future.result()
+                except BrokenProcessPool:
+                    # Çöken işçi havuzda yenilenir; bu grafik yerinde çizilir
+                    self._png = self._render()
+            else:
+                self._png = self._render()
+            get_render_cache().put(self.key, self._png)
+            if self.export_path:
+                _export(self._png, self.export_path)
+        return self._png
+
+
+def submit_render(chart_type, filters, version, chart, *args, export_path=None):
+    """Grafiği önbellekten alır ya da çizimini başlatır; sonuç `RenderJob.result()` ile alınır.
+
+    `chart`, charts.py'deki çizim fonksiyonunun adıdır. Paralel çizim açıksa önbellekte olmayan grafikler süreç havuzuna gönderilir,
+    böylece sayfadaki bağımsız grafikler aynı anda çizilir.
+    """
+    key = render_key(chart_type, filters, version, args)
+    png = get_render_cache().get(key)
+    if png is not None:
+        return RenderJob(key, chart, args, export_path, png=png)
+    pool = get_render_pool()
+    future = None
+    if pool is not None:
+        try:
+            future = pool.submit(chart, *args)
+        except RuntimeError:
+            # Havuz kapatılmış (sunucu kapanıyor); grafik yerinde çizilir
+            pass
+    return RenderJob(key, chart, args, export_path, future=future)
+
+
+def cached_render(chart_type, filters, version, chart, *args, export_path=None):
+    """Grafiğin PNG baytlarını önbellekten döndürür; yoksa charts.py'deki `chart` adlı fonksiyonla çizer.
+
+    `filters`, grafiği etkileyen kenar çubuğu seçimleridir ({ad: değerler}).
+    """
+    return submit_render(chart_type, filters, version, chart, *args,
+                         export_path=export_path).result()
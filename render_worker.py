@@ -0,0 +1,43 @@
+"""Grafik çizim işçisi; render_cache.RenderPool tarafından ayrı bir süreç olarak başlatılır.
+
+    python render_worker.py
+
+İşçi bağımsız bir betik olarak açılır: multiprocessing'in "spawn" yöntemi
+çocuk süreçte ana modülü (Streamlit'te sayfa betiği) yeniden yürütür, bu
+betik ise yalnızca charts'ı yükler.
+
+Protokol: stdin'den pickle ile (charts.py fonksiyon adı, argümanlar) okunur,
+stdout'a ("ok", png) ya da ("error", istisna) yazılır. stdin kapanınca
+(sunucu kapandı ya da işçi yenileniyor) süreç sona erer.
+"""
+import pickle
+import sys
+
+
+def serve(stdin, stdout):
+    # charts (matplotlib) açılışta yüklenir; ilk çizim yükleme süresini beklemez
+    import charts
+
+    while True:
+        try:
+            chart, args = pickle.load(stdin)
+        except EOFError:
+            return
+        try:
+            result = ("ok", charts.render_png(getattr(charts, chart), *args))
+        except Exception as exc:
+            result = ("error", exc)
+        try:
+            payload = pickle.dumps(result)
+        except Exception:
+            # pickle'lanamayan istisna metniyle iletilir
+            payload = pickle.dumps(("error", RuntimeError(f"{type(result[1]).__name__}: {result[1]}")))
+        stdout.write(payload)
+        stdout.flush()
+
+
+if __name__ == "__main__":
+    stdin, stdout = sys.stdin.buffer, sys.stdout.buffer
+    # stdout yalnızca protokole ayrılır; kazara yazılan çıktılar stderr'e gider
+    sys.stdout = sys.stderr
+    serve(stdin, stdout)
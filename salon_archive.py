@@ -0,0 +1,266 @@
+"""Çok sezonlu müsabaka arşivi.
+
+Sonuçlar dataset/archive altında sezon ve müsabakaya göre bölümlenmiş (Hive
+düzeni) Parquet dosyaları olarak tutulur:
+
+    dataset/archive/season=2025/competition=salon/part-0.parquet
+
+Sorgular pyarrow.dataset ile yapılır: sezon/müsabaka seçimi yalnızca ilgili
+klasörün okunmasını, İL/KATEGORİ seçimi ise satır grubu istatistikleriyle
+eşleşmeyen satır gruplarının atlanmasını sağlar. Yeni bir sezon eklemek eski
+sezonların önbelleklerini geçersiz kılmaz.
+
+Yeni sezon aktarımı:
+
+    python salon_archive.py dataset/2025salonfinal.csv --season 2025 --competition salon
+
+Aktarılan CSV'nin yolu, parmak izi (mtime, boyut) ve SHA-256 özeti bölüm
+dosyasının metadata'sında tutulur. CSV'nin içeriği sonradan değişirse
+`refresh_partition` bölümü sayfa açılırken yeniden aktarır; sürüm anahtarı
+değiştiğinden önbellekler de geçersiz olur.
+"""
+import argparse
+import hashlib
+import json
+import os
+import shutil
+import threading
+
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+import streamlit as st
+
+from datastore import SOURCE_META_KEY, file_digest, file_fingerprint, read_source_meta
+from salon_data import CATEGORY_COLUMNS, CUBE_KEYS, build_score_cube, parse_results_csv
+
+ARCHIVE_DIR = os.path.join("dataset", "archive")
+# Satır gruplarının boyutu; veriler (KATEGORİ, İL) sırasıyla yazıldığından
+# seçilmeyen kategori/il aralıkları grup istatistiklerinden elenir
+ROW_GROUP_SIZE = 64 * 1024
+# Kaynak dosyadaki satır sırası; okumada bu sıra geri kurulur
+ROW_COLUMN = "_source_row"
+
+PART_FILE = "part-0.parquet"
+# Aynı süreçteki oturumlar bir bölümü aynı anda yeniden aktarmaz
+_REFRESH_LOCK = threading.Lock()
+# İçeriği özetle doğrulanmış parmak izleri (bölüm dosyası -> parmak izi); yalnızca
+# mtime'ı değişen CSV (ör. depo yeniden klonlandı) her rerun'da yeniden özetlenmez
+_VERIFIED = {}
+
+COMPETITION_LABELS = {
+    "salon": "Salon",
+    "acikhava": "Açık Hava",
+}
+
+# Tüm sezonlar aynı şemayla yazılır; böylece bölümler birlikte taranabilir.
+# Metin sütunları düz string'dir: pyarrow satır grubu istatistiklerini sözlük
+# (dictionary) türündeki sütunlarda kullanmaz. Parquet sayfaları yine sözlükle
+# kodlanır; pandas'a okunurken CATEGORY_COLUMNS kategorik yapılır.
+ARCHIVE_SCHEMA = pa.schema([
+    ("id", pa.int32()),
+    ("SIRANO", pa.int32()),
+    ("İL", pa.string()),
+    ("KULÜB", pa.string()),
+    ("ADI", pa.string()),
+    ("KATEGORİ", pa.string()),
+    ("GRUP", pa.string()),
+    ("PUTA", pa.int16()),
+    ("SERİSİ", pa.string()),
+    ("HALKAPUANI", pa.float32()),
+    ("İSABET", pa.float32()),
+    ("TOPLAM", pa.int16()),
+    ("AÇIKLAMA", pa.string()),
+    (ROW_COLUMN, pa.int32()),
+])
+PARTITIONING = ds.partitioning(
+    pa.schema([("season", pa.int16()), ("competition", pa.string())]), flavor="hive")
+
+
+def competition_label(season, competition):
+    return f"{season} {COMPETITION_LABELS.get(competition, competition.title())}"
+
+
+def partition_dir(season, competition, archive_dir=ARCHIVE_DIR):
+    return os.path.join(archive_dir, f"season={season}", f"competition={competition}")
+
+
+def list_partitions(archive_dir=ARCHIVE_DIR):
+    """Arşivdeki (sezon, müsabaka) bölümleri, en yeni sezon başta.
+
+    Yalnızca klasör adları okunur; Parquet dosyaları açılmaz.
+    """
+    partitions = []
+    if not os.path.isdir(archive_dir):
+        return partitions
+    for season_entry in os.scandir(archive_dir):
+        if not (season_entry.is_dir() and season_entry.name.startswith("season=")):
+            continue
+        for entry in os.scandir(season_entry.path):
+            if entry.is_dir() and entry.name.startswith("competition="):
+                partitions.append((int(season_entry.name[len("season="):]),
+                                   entry.name[len("competition="):]))
+    return sorted(partitions, key=lambda p: (-p[0], p[1]))
+
+
+def partition_version(season, competition, archive_dir=ARCHIVE_DIR):
+    """Bölümün sürüm anahtarı: klasördeki dosyaların adı, mtime ve boyutu."""
+    directory = partition_dir(season, competition, archive_dir)
+    digest = hashlib.sha1(f"{season}/{competition}".encode("utf-8"))
+    for entry in sorted(os.scandir(directory), key=lambda e: e.name):
+        if entry.name.endswith(".parquet"):
+            stat = entry.stat()
+            digest.update(f"{entry.name}:{stat.st_mtime_ns}:{stat.st_size};".encode("utf-8"))
+    return digest.hexdigest()[:16]
+
+
+def to_archive_table(df):
+    """Sonuç tablosunu arşiv şemasına çevirir; eksik sütunlar boş kalır."""
+    df = df.assign(**{ROW_COLUMN: range(len(df))})
+    df = df.sort_values(["KATEGORİ", "İL"], kind="stable", na_position="last")
+    columns = []
+    for field in ARCHIVE_SCHEMA:
+        if field.name in df.columns:
+            values = pa.array(df[field.name], from_pandas=True)
+            if pa.types.is_dictionary(values.type):
+                values = values.dictionary_decode()
+            columns.append(values.cast(field.type))
+        else:
+            columns.append(pa.nulls(len(df), field.type))
+    return pa.Table.from_arrays(columns, schema=ARCHIVE_SCHEMA)
+
+
+def import_results(csv_path, season, competition, archive_dir=ARCHIVE_DIR):
+    """Bir müsabaka CSV'sini arşive (varsa üzerine yazarak) aktarır; bölüm klasörünü döndürür."""
+    source_meta = {"path": csv_path, "fingerprint": list(file_fingerprint(csv_path)),
+                   "sha256": file_digest(csv_path)}
+    table = to_archive_table(parse_results_csv(csv_path))
+    table = table.replace_schema_metadata({SOURCE_META_KEY: json.dumps(source_meta).encode("utf-8")})
+    directory = partition_dir(season, competition, archive_dir)
+    # Geçici klasörler "." ile başlar: pyarrow ve list_partitions bunları bölüm saymaz,
+    # yarıda kalan bir aktarım sorgulara karışmaz
+    parent, name = os.path.split(directory)
+    tmp_dir = os.path.join(parent, f".tmp-{name}")
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+    os.makedirs(tmp_dir)
+    pq.write_table(table, os.path.join(tmp_dir, PART_FILE), row_group_size=ROW_GROUP_SIZE)
+    # Bölüm bir bütün olarak değiştirilir; okuyucular yarım yazılmış dosya görmez
+    if os.path.isdir(directory):
+        old_dir = os.path.join(parent, f".old-{name}")
+        shutil.rmtree(old_dir, ignore_errors=True)
+        os.replace(directory, old_dir)
+        os.replace(tmp_dir, directory)
+        shutil.rmtree(old_dir)
+    else:
+        os.replace(tmp_dir, directory)
+    return directory
+
+
+def refresh_partition(season, competition, archive_dir=ARCHIVE_DIR):
+    """Kaynak CSV aktarımdan sonra değiştiyse bölümü yeniden aktarır; aktarıldıysa True.
+
+    Her rerun'da çağrılabilir: CSV'nin parmak izi ve Parquet dosyasının
+    metadata'sı okunur; parmak izi değiştiyse içerik SHA-256 ile doğrulanır.
+    Kaynağı kayıtlı olmayan ya da CSV'si bulunmayan bölümler olduğu gibi kullanılır.
+    """
+    part_path = os.path.join(partition_dir(season, competition, archive_dir), PART_FILE)
+
+    def up_to_date(meta):
+        fingerprint = list(file_fingerprint(meta["path"]))
+        return fingerprint == meta["fingerprint"] or _VERIFIED.get(part_path) == fingerprint
+
+    meta = read_source_meta(part_path)
+    if not meta or not os.path.exists(meta["path"]) or up_to_date(meta):
+        return False
+    with _REFRESH_LOCK:
+        # Kilit beklenirken başka bir oturum aktarmış ya da doğrulamış olabilir
+        meta = read_source_meta(part_path)
+        if up_to_date(meta):
+            return False
+        if file_digest(meta["path"]) == meta.get("sha256"):
+            # İçerik aynı: bölüm yeniden yazılmaz, yeni parmak izi bu süreçte hatırlanır
+            _VERIFIED[part_path] = list(file_fingerprint(meta["path"]))
+            return False
+        import_results(meta["path"], season, competition, archive_dir)
+    return True
+
+
+def _archive_dataset(archive_dir):
+    return ds.dataset(archive_dir, format="parquet", schema=ARCHIVE_SCHEMA.append(
+        pa.field("season", pa.int16())).append(pa.field("competition", pa.string())),
+        partitioning=PARTITIONING)
+
+
+def _isin(column, values):
+    # Seçimdeki boş değer (NaN) boş hücrelerle eşleşir, pandas isin gibi
+    values = list(values)
+    present = [value for value in values if isinstance(value, str)]
+    # Tür açıkça verilir; boş seçimde pyarrow null türlü dizi kurup hata verir
+    expression = ds.field(column).isin(pa.array(present, type=pa.string()))
+    if len(present) < len(values):
+        expression = expression | ds.field(column).is_null()
+    return expression
+
+
+def scan_results(season, competition, columns=None, cities=None, categories=None, archive_dir=ARCHIVE_DIR):
+    """Bölümden seçilen satırları kaynak sırasıyla okur.
+
+    Sezon/müsabaka, İL ve KATEGORİ koşulları taramaya iletilir; diğer bölümler
+    ve eşleşmeyen satır grupları diskten okunmaz.
+    """
+    expression = (ds.field("season") == season) & (ds.field("competition") == competition)
+    if cities is not None:
+        expression = expression & _isin("İL", cities)
+    if categories is not None:
+        expression = expression & _isin("KATEGORİ", categories)
+    read_columns = list(columns or [field.name for field in ARCHIVE_SCHEMA if field.name != ROW_COLUMN])
+    table = _archive_dataset(archive_dir).to_table(columns=read_columns + [ROW_COLUMN], filter=expression)
+    df = table.to_pandas()
+    for column in CATEGORY_COLUMNS:
+        if column in df.columns:
+            df[column] = df[column].astype("category")
+    return df.sort_values(ROW_COLUMN, kind="stable", ignore_index=True).drop(columns=ROW_COLUMN)
+
+
+@st.cache_data(show_spinner=False, max_entries=4)
+def season_cube(season, competition, version, archive_dir=ARCHIVE_DIR):
+    """Bölümün istatistik küpü; yalnızca küp anahtarları ve TOPLAM okunur."""
+    return build_score_cube(scan_results(season, competition, CUBE_KEYS + ["TOPLAM"],
+                                         archive_dir=archive_dir))
+
+
+@st.cache_data(show_spinner=False, max_entries=4)
+def city_participation(season, competition, version, archive_dir=ARCHIVE_DIR):
+    """İllere göre katılan/katılmayan sayıları, toplama göre azalan sırada.
+
+    Kenar çubuğu seçiminden bağımsızdır; yalnızca bölüm değişince yeniden hesaplanır.
+    """
+    participation_df = season_cube(season, competition, version, archive_dir).participation_by("İL")
+    participation_df.index = participation_df.index.astype(object)
+    # Toplam katılımcı sayısına göre sırala
+    total = participation_df['Katılanlar'] + participation_df['Katılmayanlar']
+    return (participation_df.assign(Toplam=total)
+            .sort_values('Toplam', ascending=False, kind='stable')
+            .drop('Toplam', axis=1))
+
+
+@st.cache_data(show_spinner=False, max_entries=8)
+def filtered_results(season, competition, cities, categories, version, archive_dir=ARCHIVE_DIR):
+    """Kenar çubuğu seçimine giren satırlar (tablo önizlemesi için)."""
+    return scan_results(season, competition, cities=cities, categories=categories, archive_dir=archive_dir)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Müsabaka sonuçlarını sezon arşivine aktarır")
+    parser.add_argument("csv", help="Sonuç CSV dosyası (2025salonfinal.csv ile aynı sütunlar)")
+    parser.add_argument("--season", type=int, required=True, help="Sezon yılı, ör. 2025")
+    parser.add_argument("--competition", required=True,
+                        help=f"Müsabaka adı ({', '.join(COMPETITION_LABELS)} ya da yeni bir ad)")
+    parser.add_argument("--archive", default=ARCHIVE_DIR, help="Arşiv klasörü")
+    args = parser.parse_args(argv)
+    directory = import_results(args.csv, args.season, args.competition, args.archive)
+    print(f"{competition_label(args.season, args.competition)} -> {directory}")
+
+
+if __name__ == "__main__":
+    main()
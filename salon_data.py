@@ -0,0 +1,129 @@
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+# Sonuç CSV'si; sayfalar arşivden okur (salon_archive.py ile aktarılır)
+RESULTS_PATH = "dataset/2025salonfinal.csv"
+
+# Tekrarlanan metin sütunları kategorik olarak tutulur (il, kulüp, kategori...)
+CATEGORY_COLUMNS = ["İL", "KULÜB", "KATEGORİ", "GRUP", "SERİSİ"]
+
+
+def parse_results_csv(path):
+    """CSV'yi kategorik metin sütunları ve küçültülmüş sayısal tiplerle ayrıştırır."""
+    df = pd.read_csv(path, dtype={col: "category" for col in CATEGORY_COLUMNS})
+    for col in df.select_dtypes("integer").columns:
+        df[col] = pd.to_numeric(df[col], downcast="integer")
+    for col in df.select_dtypes("float").columns:
+        df[col] = pd.to_numeric(df[col], downcast="float")
+    return df
+
+
+#################################################################################
+# Önceden hesaplanmış istatistik küpü: (İL, KATEGORİ, KULÜB) hücreleri
+CUBE_KEYS = ["İL", "KATEGORİ", "KULÜB"]
+
+
+@dataclass(frozen=True)
+class ScoreCube:
+    """Her (il, kategori, kulüp) hücresi için katılım sayıları ve puan histogramı.
+
+    `hist[i, p]`, i. hücrede TOPLAM puanı p olan katılımcı (TOPLAM > 0) sayısıdır.
+    Puanlar tam sayı olduğundan histogram aynı zamanda kesin bir kantil özetidir;
+    kenar çubuğu seçimleri satırlar yerine hücreler birleştirilerek yanıtlanır.
+    """
+
+    cells: pd.DataFrame
+    hist: np.ndarray
+
+    @property
+    def scores(self):
+        return np.arange(self.hist.shape[1])
+
+    def select(self, cities, categories):
+        """Kenar çubuğu seçimine giren hücrelerin maskesi."""
+        return (self.cells["İL"].isin(cities) & self.cells["KATEGORİ"].isin(categories)).to_numpy()
+
+    def participation(self, mask=None):
+        """(katılan, katılmayan) sporcu sayıları."""
+        cells = self.cells if mask is None else self.cells[mask]
+        return int(cells["Katılanlar"].sum()), int(cells["Katılmayanlar"].sum())
+
+    def participation_by(self, column, mask=None):
+        """`column` değerlerine göre katılan/katılmayan sayıları (ilk görülme sırasıyla)."""
+        cells = self.cells if mask is None else self.cells[mask]
+        return cells.groupby(column, observed=True, dropna=False, sort=False)[
+            ["Katılanlar", "Katılmayanlar"]].sum()
+
+    def histograms_by(self, column, mask=None):
+        """`column` değerlerine göre birleştirilmiş puan histogramları.
+
+        Sonuç, satırları etiket ve sütunları puan olan bir DataFrame'dir.
+        """
+        keys = self.cells[column]
+        hist = self.hist
+        if mask is not None:
+            keys, hist = keys[mask], hist[mask]
+        return pd.DataFrame(hist, index=pd.Index(keys, name=column)).groupby(
+            level=0, observed=True, dropna=False, sort=False).sum()
+
+
+def build_score_cube(df):
+    """Sonuç tablosunu (il, kategori, kulüp) hücrelerine indirger."""
+    grouped = df.groupby(CUBE_KEYS, observed=True, dropna=False, sort=False)
+    cell_ids = grouped.ngroup().to_numpy()
+    n_cells = grouped.ngroups
+    totals = df["TOPLAM"].to_numpy()
+    participant = totals > 0
+
+    cells = grouped.size().index.to_frame(index=False)
+    cells["Katılanlar"] = np.bincount(cell_ids[participant], minlength=n_cells)
+    cells["Katılmayanlar"] = np.bincount(cell_ids[totals == 0], minlength=n_cells)
+
+    scores = np.rint(totals[participant]).astype(np.int64)
+    width = int(scores.max()) + 1 if scores.size else 1
+    hist = np.bincount(cell_ids[participant] * width + scores,
+                       minlength=n_cells * width).reshape(n_cells, width)
+    return ScoreCube(cells=cells, hist=hist)
+
+
+def _percentile(scores, counts, q):
+    # np.percentile (linear) ile aynı sonuç; veriyi açmadan kümülatif sayımlardan hesaplanır
+    cumulative = np.cumsum(counts)
+    position = q / 100 * (cumulative[-1] - 1)
+    lower, frac = int(np.floor(position)), position - np.floor(position)
+    lo = scores[np.searchsorted(cumulative, lower, side="right")]
+    hi = scores[np.searchsorted(cumulative, min(lower + 1, cumulative[-1] - 1), side="right")]
+    return lo + (hi - lo) * frac
+
+
+def box_stats(counts, label=None, whis=1.5):
+    """Puan histogramından matplotlib `Axes.bxp` için kutu grafiği istatistikleri.
+
+    `matplotlib.cbook.boxplot_stats` ile aynı tanımları kullanır (1.5 IQR bıyıklar).
+    """
+    counts = np.asarray(counts)
+    scores = np.flatnonzero(counts)
+    counts = counts[scores]
+    q1, med, q3 = (_percentile(scores, counts, q) for q in (25, 50, 75))
+    iqr = q3 - q1
+    inside = (scores >= q1 - whis * iqr) & (scores <= q3 + whis * iqr)
+    # Kutunun içine düşen bıyık uçları kutu kenarına çekilir (boxplot_stats gibi)
+    whislo = min(scores[inside].min(), q1) if inside.any() else q1
+    whishi = max(scores[inside].max(), q3) if inside.any() else q3
+    outside = (scores < whislo) | (scores > whishi)
+    fliers = np.repeat(scores[outside], counts[outside]).astype(float)
+    return {
+        "label": label,
+        "mean": float(np.average(scores, weights=counts)),
+        "med": med, "q1": q1, "q3": q3, "iqr": iqr,
+        "whislo": whislo, "whishi": whishi,
+        "fliers": fliers,
+    }
+
+
+def box_stats_by(hists):
+    """Histogram tablosunun (satır = grup) boş olmayan her satırı için kutu istatistikleri."""
+    return [box_stats(counts.to_numpy(), label)
+            for label, counts in hists.iterrows() if counts.sum() > 0]
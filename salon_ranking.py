@@ -0,0 +1,154 @@
+"""Sporcu sıralamaları.
+
+Sıralamalar bölüm sürümü başına bir kez, tek bir vektörel geçişte hesaplanır:
+kategori içinde, kategori+il içinde ve kategori+kulüp içinde. Sıralama ölçütü
+TOPLAM'dır; eşitlikte İSABET'i yüksek olan öndedir, ikisi de eşitse sporcular
+aynı sırayı paylaşır. Yarışmaya katılmayanlar (TOPLAM 0) sıralanmaz.
+
+İki sıra türü tutulur:
+
+    olimpik: 1, 2, 2, 4   (eşitlerden sonra sıra atlanır)
+    yoğun:   1, 2, 2, 3
+"""
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from salon_archive import ARCHIVE_DIR, scan_results
+
+RANKING_COLUMNS = ["ADI", "İL", "KULÜB", "KATEGORİ", "HALKAPUANI", "İSABET", "TOPLAM"]
+
+# Sıralama kapsamı -> gruplama sütunları; tüm kapsamlar kategori içindedir
+RANK_SCOPES = {
+    "Kategori": ["KATEGORİ"],
+    "İl": ["KATEGORİ", "İL"],
+    "Kulüp": ["KATEGORİ", "KULÜB"],
+}
+RANK_METHODS = {
+    "olimpik": "Sırası",
+    "yoğun": "Sırası (yoğun)",
+}
+
+
+def rank_column(scope, method="olimpik"):
+    """Kapsam ve sıra türünün tablo sütun adı, ör. "İl Sırası"."""
+    return f"{scope} {RANK_METHODS[method]}"
+
+
+def search_keys(names):
+    """Ad arama anahtarları: Türkçe büyük harf (i -> İ, ı -> I), baş/son boşluksuz."""
+    keys = np.strings.strip(np.asarray(names, dtype=str))
+    return np.strings.upper(np.strings.replace(np.strings.replace(keys, "i", "İ"), "ı", "I"))
+
+
+def group_ranks(groups, toplam, isabet):
+    """`groups` kodlarıyla belirlenen her grup içinde (olimpik, yoğun) sıralar ve sıralama düzeni.
+
+    Döndürülen `order`, satırları grup sırasıyla ve her grup içinde sıralamaya
+    göre dizer. Eksik İSABET en düşük değer sayılır.
+    """
+    toplam = np.asarray(toplam, dtype=np.float64)
+    isabet = np.nan_to_num(np.asarray(isabet, dtype=np.float64), nan=-np.inf)
+    order = np.lexsort((-isabet, -toplam, groups))
+
+    sorted_groups = groups[order]
+    sorted_toplam, sorted_isabet = toplam[order], isabet[order]
+    positions = np.arange(len(order))
+    new_group = np.ones(len(order), dtype=bool)
+    new_group[1:] = sorted_groups[1:] != sorted_groups[:-1]
+    new_score = new_group.copy()
+    new_score[1:] |= (sorted_toplam[1:] != sorted_toplam[:-1]) | (sorted_isabet[1:] != sorted_isabet[:-1])
+
+    # Grubun ilk satırının konumu ve o ana kadarki farklı skor sayısı ileriye taşınır
+    group_start = np.maximum.accumulate(np.where(new_group, positions, 0))
+    score_start = np.maximum.accumulate(np.where(new_score, positions, 0))
+    distinct = np.cumsum(new_score)
+
+    competition = np.empty(len(order), dtype=np.int32)
+    dense = np.empty(len(order), dtype=np.int32)
+    competition[order] = score_start - group_start + 1
+    dense[order] = distinct - distinct[group_start] + 1
+    return competition, dense, order
+
+
+@dataclass(frozen=True)
+class Rankings:
+    """Katılımcı tablosu, sıra sütunları ve sorgu indeksleri.
+
+    `order`/`offsets` kategori sıralamasını CSR düzeninde tutar: `categories[i]`
+    kategorisinin satırları `order[offsets[i]:offsets[i + 1]]`, sıra düzeninde.
+    Ad araması `name_keys` üzerinde ikili aramayla yapılır.
+    """
+    frame: pd.DataFrame
+    categories: list
+    order: np.ndarray
+    offsets: np.ndarray
+    name_keys: np.ndarray
+    name_order: np.ndarray
+
+    def __len__(self):
+        return len(self.frame)
+
+    def ranked(self, category, cities=None):
+        """Kategorideki sporcuların konumları, sıra düzeninde; bilinmeyen kategori (ya da None) boş."""
+        if category not in self.categories:
+            return self.order[:0]
+        i = self.categories.index(category)
+        positions = self.order[self.offsets[i]:self.offsets[i + 1]]
+        if cities is not None:
+            positions = positions[self.frame["İL"].isin(list(cities)).to_numpy()[positions]]
+        return positions
+
+    def find(self, prefix, limit=None):
+        """Adı `prefix` ile başlayan sporcuların konumları, ad sırasıyla."""
+        key = str(search_keys([prefix])[0])
+        if not key:
+            return self.name_order[:0]
+        start = np.searchsorted(self.name_keys, key, side="left")
+        end = np.searchsorted(self.name_keys, key + "\uffff", side="left")
+        positions = self.name_order[start:end]
+        return positions if limit is None else positions[:limit]
+
+    def rows(self, positions):
+        return self.frame.iloc[positions]
+
+
+def build_rankings(df):
+    """Sonuç tablosundan (RANKING_COLUMNS) sıralamalar ve indeksler."""
+    frame = df.loc[df["TOPLAM"] > 0, RANKING_COLUMNS].reset_index(drop=True)
+    for column in ("HALKAPUANI", "İSABET", "TOPLAM"):
+        # Arşivde float32/int16 tutulur; sıralama ve gösterim tam sayılarla
+        frame[column] = frame[column].astype("Int64")
+    toplam = frame["TOPLAM"].to_numpy(dtype=np.float64)
+    isabet = frame["İSABET"].to_numpy(dtype=np.float64, na_value=np.nan)
+
+    order = None
+    for scope, keys in RANK_SCOPES.items():
+        groups = frame.groupby(keys, sort=True, observed=True, dropna=False).ngroup().to_numpy()
+        competition, dense, scope_order = group_ranks(groups, toplam, isabet)
+        frame[rank_column(scope, "olimpik")] = competition
+        frame[rank_column(scope, "yoğun")] = dense
+        if order is None:
+            order = scope_order
+
+    category_codes = frame["KATEGORİ"].astype("category")
+    categories = list(category_codes.cat.categories)
+    counts = np.bincount(category_codes.cat.codes.to_numpy()[category_codes.cat.codes.to_numpy() >= 0],
+                         minlength=len(categories))
+    offsets = np.concatenate([[0], np.cumsum(counts)])
+
+    keys = search_keys(frame["ADI"].fillna("").to_numpy())
+    name_order = np.argsort(keys, kind="stable")
+    return Rankings(frame, categories, order, offsets, keys[name_order], name_order)
+
+
+@st.cache_resource(show_spinner=False, max_entries=4)
+def season_rankings(season, competition, version, archive_dir=ARCHIVE_DIR):
+    """Bölümün sıralamaları; yalnızca sıralama sütunları okunur.
+
+    Sıralamalar yalnızca okunur; cache_data her rerun'da tüm tabloyu ve
+    indeksleri kopyalardı, cache_resource süreç genelinde tek kopya paylaştırır.
+    """
+    return build_rankings(scan_results(season, competition, RANKING_COLUMNS, archive_dir=archive_dir))
@@ -0,0 +1,190 @@
+import numpy as np
+
+# İstemci tarafında çizilen (Vega-Lite) grafikler. Fonksiyonlar charts.py'deki
+# karşılıklarıyla aynı adı ve argümanları alır, ancak PNG yerine yalnızca önceden
+# toplanmış veriyi (histogram kutuları, beş sayı özeti, zaman serisi noktaları)
+# içeren bir Vega-Lite tanımı döndürür; çizimi tarayıcı yapar.
+
+colors = ['skyblue', 'plum']
+participation_labels = ['Katılanlar', 'Katılmayanlar']
+
+
+def participation_pie(participants, non_participants):
+    return {
+        "title": "Yarışmaya Katılım Oranı",
+        "data": {"values": [
+            {"Durum": label, "Sayı": int(count)}
+            for label, count in zip(participation_labels, [participants, non_participants])
+        ]},
+        "mark": {"type": "arc", "tooltip": True},
+        "encoding": {
+            "theta": {"field": "Sayı", "type": "quantitative", "stack": "normalize"},
+            "color": {"field": "Durum", "type": "nominal", "sort": participation_labels,
+                      "scale": {"domain": participation_labels, "range": colors}},
+        },
+    }
+
+
+def city_participation(participation_df):
+    values = [
+        {"İl": str(city), "Katılım Durumu": status, "Sporcu Sayısı": int(count)}
+        for city, row in participation_df.iterrows()
+        for status, count in row.items()
+    ]
+    return {
+        "title": "Her Şehirden Katılan ve Katılmayan Sporcu Sayısı",
+        "data": {"values": values},
+        "mark": {"type": "bar", "tooltip": True},
+        "encoding": {
+            "x": {"field": "İl", "type": "nominal", "sort": [str(city) for city in participation_df.index],
+                  "axis": {"labelAngle": -90}},
+            "y": {"field": "Sporcu Sayısı", "type": "quantitative", "stack": "zero"},
+            "color": {"field": "Katılım Durumu", "type": "nominal",
+                      "scale": {"domain": list(participation_df.columns), "range": colors}},
+            "order": {"field": "Katılım Durumu", "sort": "ascending"},
+        },
+    }
+
+
+def score_box_plot(stats, xlabel, vertical_labels=True):
+    """Kutu grafiği: her grup için yalnızca beş sayı özeti ve aykırı değerler gönderilir."""
+    labels = [str(stat["label"]) for stat in stats]
+    summary = [
+        {"Grup": str(stat["label"]),
+         **{key: float(stat[key]) for key in ("whislo", "q1", "med", "q3", "whishi")}}
+        for stat in stats
+    ]
+    fliers = [
+        {"Grup": str(stat["label"]), "Toplam Puan": float(value)}
+        for stat in stats for value in np.unique(stat["fliers"])
+    ]
+    x = {"field": "Grup", "type": "nominal", "sort": labels, "title": xlabel,
+         "axis": {"labelAngle": -90 if vertical_labels else 0}}
+    color = {"field": "Grup", "type": "nominal", "sort": labels, "legend": None,
+             "scale": {"scheme": "category20"}}
+    y_title = "Toplam Puan"
+    return {
+        "layer": [
+            {"data": {"values": summary}, "layer": [
+                {"mark": {"type": "rule", "color": "#444"},
+                 "encoding": {"x": x, "y": {"field": "whislo", "type": "quantitative", "title": y_title,
+                                            "scale": {"zero": False}},
+                              "y2": {"field": "whishi"}}},
+                {"mark": {"type": "bar", "size": 28, "stroke": "#444", "tooltip": True},
+                 "encoding": {"x": x, "y": {"field": "q1", "type": "quantitative"},
+                              "y2": {"field": "q3"}, "color": color}},
+                {"mark": {"type": "tick", "color": "#444", "size": 28},
+                 "encoding": {"x": x, "y": {"field": "med", "type": "quantitative"}}},
+            ]},
+            {"data": {"values": fliers},
+             "mark": {"type": "point", "color": "#444"},
+             "encoding": {"x": x, "y": {"field": "Toplam Puan", "type": "quantitative"}}},
+        ],
+    }
+
+
+def category_histogram(kategori, counts):
+    """Histogram: PNG ile aynı 21 kutu sunucuda hesaplanır, yalnızca kutu sayıları gönderilir."""
+    counts = np.asarray(counts)
+    scores = np.flatnonzero(counts)
+    n, edges = np.histogram(scores, bins=21, weights=counts[scores])
+    values = [
+        {"Başlangıç": float(start), "Bitiş": float(end), "Sporcu Sayısı": int(count)}
+        for start, end, count in zip(edges[:-1], edges[1:], n)
+    ]
+    return {
+        "title": f"{kategori} Kategorisi Puan Dağılımı",
+        "data": {"values": values},
+        "layer": [
+            {"mark": {"type": "bar", "color": "skyblue", "stroke": "white", "tooltip": True},
+             "encoding": {
+                 "x": {"field": "Başlangıç", "type": "quantitative", "title": "Toplam Puan",
+                       "scale": {"domain": [0, 105]}, "axis": {"values": list(range(0, 110, 5))}},
+                 "x2": {"field": "Bitiş"},
+                 "y": {"field": "Sporcu Sayısı", "type": "quantitative"},
+             }},
+            {"mark": {"type": "text", "dy": -6},
+             "transform": [{"filter": "datum['Sporcu Sayısı'] > 0"},
+                           {"calculate": "(datum['Başlangıç'] + datum['Bitiş']) / 2", "as": "Orta"}],
+             "encoding": {
+                 "x": {"field": "Orta", "type": "quantitative"},
+                 "y": {"field": "Sporcu Sayısı", "type": "quantitative"},
+                 "text": {"field": "Sporcu Sayısı", "type": "quantitative"},
+             }},
+        ],
+    }
+
+
+def time_series(title, dates, values, y_title, reference_low=None, reference_high=None):
+    """Tahlil zaman serisi: noktalar ve (varsa) referans aralığı çizgileri.
+
+    Sayısal olmayan (NaN) sonuçlar atlanır; spec JSON olarak gönderilir ve NaN geçerli JSON değildir.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    finite = np.isfinite(values)
+    points = [
+        {"Tarih": np.datetime_as_string(date, unit="s"), "Sonuç": float(value)}
+        for date, value in zip(np.asarray(dates, dtype="datetime64[s]")[finite], values[finite])
+    ]
+    layers = [{
+        "data": {"values": points},
+        "mark": {"type": "line", "point": True, "tooltip": True},
+        "encoding": {
+            "x": {"field": "Tarih", "type": "temporal"},
+            "y": {"field": "Sonuç", "type": "quantitative", "title": y_title},
+        },
+    }]
+    if reference_low is not None and reference_high is not None:
+        layers.append({
+            "data": {"values": [{"Referans": "Referans Alt", "Değer": reference_low},
+                                {"Referans": "Referans Üst", "Değer": reference_high}]},
+            "mark": {"type": "rule", "color": "red", "strokeDash": [2, 2]},
+            "encoding": {"y": {"field": "Değer", "type": "quantitative"}},
+        })
+    return {"title": title, "layer": layers}
+
+
+def small_multiples(panels):
+    """Tahlil karşılaştırması: ortak zaman ekseninde her tahlil için bir satır.
+
+    `panels`, (tahlil, birim, tarihler, sonuçlar, alt, üst) demetleridir; diziler
+    önceden seyreltilmiş olmalıdır. Referans aralığı bant, dışındaki sonuçlar
+    kırmızı nokta olarak çizilir.
+    """
+    names = [panel[0] for panel in panels]
+    values = []
+    for name, unit, dates, results, lows, highs in panels:
+        for date, value, low, high in zip(np.asarray(dates, dtype="datetime64[s]"), results, lows, highs):
+            banded = not (np.isnan(low) or np.isnan(high))
+            values.append({
+                "Tahlil": name,
+                "Birim": unit,
+                "Tarih": np.datetime_as_string(date, unit="s"),
+                "Sonuç": float(value),
+                "Alt": float(low) if banded else None,
+                "Üst": float(high) if banded else None,
+                "Referans Dışı": banded and not low <= value <= high,
+            })
+    x = {"field": "Tarih", "type": "temporal", "title": None}
+    return {
+        "data": {"values": values},
+        "facet": {"row": {"field": "Tahlil", "type": "nominal", "sort": names, "title": None,
+                          "header": {"labelAngle": 0, "labelAlign": "left", "labelAnchor": "start",
+                                     "labelOrient": "top"}}},
+        "spec": {
+            "width": 900,
+            "height": 110,
+            "layer": [
+                {"mark": {"type": "area", "interpolate": "step-after", "color": "red", "opacity": .1},
+                 "encoding": {"x": x, "y": {"field": "Alt", "type": "quantitative"},
+                              "y2": {"field": "Üst"}}},
+                {"mark": {"type": "line", "point": {"size": 15}, "tooltip": True},
+                 "encoding": {"x": x, "y": {"field": "Sonuç", "type": "quantitative", "title": None,
+                                            "scale": {"zero": False}}}},
+                {"transform": [{"filter": "datum['Referans Dışı']"}],
+                 "mark": {"type": "point", "color": "red", "filled": True, "tooltip": True},
+                 "encoding": {"x": x, "y": {"field": "Sonuç", "type": "quantitative"}}},
+            ],
+        },
+        "resolve": {"scale": {"y": "independent"}},
+    }